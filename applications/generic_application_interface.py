@@ -18,7 +18,7 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
 from common.instance_manager_message import LogMessageType
 
@@ -83,6 +83,15 @@ class GenericApplicationInterface(ABC):
                    additional_tags: Optional[Dict[str, str]] = None) -> bool:
         pass
 
+    # Push multiple data points of the same series at once, each row is a tuple
+    # of points and additional tags. Implementations may send them as a batch.
+    def data_points(self, series_name: str, 
+                    rows: List[Tuple[Dict[str, int | float], Optional[Dict[str, str]]]]) -> bool:
+        success = True
+        for points, additional_tags in rows:
+            success = self.data_point(series_name, points, additional_tags) and success
+        return success
+
     # Mark a file or directory for preservation. See the `im preserve` command
     # for reference.
     @abstractmethod
@@ -98,10 +107,11 @@ class GenericApplicationInterface(ABC):
         pass
     
     # Run a command using subprocess Popen and stream stderr and stdout to the
-    # controller.
+    # controller. 'env' replaces the environment of the command if set.
     @abstractmethod
     def run_command_and_stream(self, command: str | List[str], 
                                shell: bool = False, timeout: Optional[int] = None, 
                                print_to_user: bool = False, 
-                               store_in_log: bool = True) -> int:
+                               store_in_log: bool = True,
+                               env: Optional[Dict[str, str]] = None) -> int:
         pass
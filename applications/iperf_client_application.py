@@ -111,16 +111,13 @@ class IperfClientApplication(BaseApplication):
             command.append("--udp")
         
         if self.settings.bandwidth_kbps is not None:
-            command.append("--bandwidth")
-            command.append(f"{self.settings.bandwidth_kbps}K")
+            command.extend(["--bandwidth", f"{self.settings.bandwidth_kbps}K"])
 
         if self.settings.length_bytes is not None:
-            command.append("--length")
-            command.append(f"{self.settings.length_bytes}")
+            command.extend(["--length", f"{self.settings.length_bytes}"])
         
         if self.settings.streams is not None:
-            command.append("--parallel")
-            command.append(str(self.settings.streams))
+            command.extend(["--parallel", str(self.settings.streams)])
         
         if self.settings.tcp_no_delay is True:
             if self.settings.udp is True:
@@ -131,24 +128,21 @@ class IperfClientApplication(BaseApplication):
             command.append("--no-delay")
         
         if runtime is not None:
-            command.append("--time")
-            command.append(str(runtime))
+            command.extend(["--time", str(runtime)])
 
-        command.append("--interval")
-        command.append(str(self.settings.report_interval))
+        command.extend(["--interval", str(self.settings.report_interval)])
 
         # --connect-timeout expects ms
-        command.append("--connect-timeout")
-        command.append(str(max(IperfClientApplication.__STATIC_DELAY_BEFORE_START, 
-                               IperfClientApplication.__CONNECT_TIMEOUT_MULTIPLIER * runtime) * 1000))
-
-        command.append("--port")
-        command.append(str(self.settings.port))
-        command.append("--client")
-        command.append(self.settings.host)
+        connect_timeout = max(IperfClientApplication.__STATIC_DELAY_BEFORE_START, 
+                              IperfClientApplication.__CONNECT_TIMEOUT_MULTIPLIER * runtime) * 1000
+        command.extend(["--connect-timeout", str(connect_timeout),
+                        "--port", str(self.settings.port),
+                        "--client", self.settings.host])
 
         try:
-           return run_iperf(command, self.interface) == 0
+           # iperf3 only prints SUM lines for more than one stream
+           parallel = self.settings.streams is not None and self.settings.streams > 1
+           return run_iperf(command, self.interface, parallel_streams=parallel) == 0
         except Exception as ex:
             traceback.print_exception(ex)
             self.interface.push_log_message(f"Iperf3 server error: {ex}", 
@@ -31,12 +31,16 @@ UDP: Client: [ ID] Interval           Transfer     Bitrate         Total Datagra
 import subprocess
 import re
 
-from typing import List
+from typing import List, Dict, Any, Optional
 from enum import Enum
 
 from applications.generic_application_interface import GenericApplicationInterface
 
 
+# '[  5]   0.00-1.00   sec ...', stream ID (or SUM) and everything after the brackets
+_STREAM_LINE_RE = re.compile(r'\[\s*(\d+|SUM)\s*\]\s*(.*)')
+
+
 class IPerfMode(Enum):
     UNKNOWN = 0,
     TCP_CLIENT = 1,
@@ -79,7 +83,7 @@ def rate_to_bytes(bits: float, unit: str) -> int:
             raise Exception(f"Unknown data rate unit '{unit}'")
 
 
-def parse_line_tcp_client(interface: GenericApplicationInterface, time, stream, line):
+def parse_line_tcp_client(time, stream, line) -> Dict[str, Any]:
     if len(line) != 7:
         raise Exception(f"Invalid iperf3 log line received.")
     
@@ -92,11 +96,10 @@ def parse_line_tcp_client(interface: GenericApplicationInterface, time, stream,
         "congestion": size_to_bytes(float(line[5]), line[6])
     }
     
-    interface.data_point("iperf-tcp-client", data)
+    return data
 
 
-
-def parse_line_tcp_server(interface: GenericApplicationInterface, time, stream, line):
+def parse_line_tcp_server(time, stream, line) -> Dict[str, Any]:
     if len(line) != 4:
         raise Exception(f"Invalid iperf3 log line received.")
 
@@ -107,10 +110,10 @@ def parse_line_tcp_server(interface: GenericApplicationInterface, time, stream,
         "bitrate": rate_to_bytes(float(line[2]), line[3]),
     }
     
-    interface.data_point("iperf-tcp-server", data)
+    return data
 
 
-def parse_line_udp_client(interface: GenericApplicationInterface, time, stream, line):
+def parse_line_udp_client(time, stream, line) -> Dict[str, Any]:
     if len(line) != 5:
         raise Exception(f"Invalid iperf3 log line received.")
     
@@ -122,10 +125,10 @@ def parse_line_udp_client(interface: GenericApplicationInterface, time, stream,
         "datagrams": int(line[4])
     }
     
-    interface.data_point("iperf-udp-client", data)
+    return data
 
 
-def parse_line_udp_server(interface: GenericApplicationInterface, time, stream, line):
+def parse_line_udp_server(time, stream, line) -> Dict[str, Any]:
     if len(line) != 8:
         raise Exception(f"Invalid iperf3 log line received.")
 
@@ -141,11 +144,21 @@ def parse_line_udp_server(interface: GenericApplicationInterface, time, stream,
         "datagrams_total": int(dgram[1])
     }
     
-    interface.data_point("iperf-udp-server", data)
+    return data
+
+
+# Measurement and line parser for each mode
+_LINE_PARSERS = {
+    IPerfMode.TCP_CLIENT: ("iperf-tcp-client", parse_line_tcp_client),
+    IPerfMode.TCP_SERVER: ("iperf-tcp-server", parse_line_tcp_server),
+    IPerfMode.UDP_CLIENT: ("iperf-udp-client", parse_line_udp_client),
+    IPerfMode.UDP_SERVER: ("iperf-udp-server", parse_line_udp_server),
+}
 
 
 def run_iperf(cli: List[str], interface: GenericApplicationInterface, 
-              report_startup: bool = False) -> int:
+              report_startup: bool = False, 
+              parallel_streams: Optional[bool] = None) -> int:
 
     process = subprocess.Popen(cli, shell=False, 
                                stdout=subprocess.PIPE, 
@@ -154,13 +167,23 @@ def run_iperf(cli: List[str], interface: GenericApplicationInterface,
     mode = IPerfMode.UNKNOWN
     pos = LogPosition.PREAMBLE
     next_could_be_delimiter = False
-    preamble_finished = False
     startup_reported = not report_startup
 
-    while process.poll() is None:
-        line = process.stdout.readline().decode("utf-8")
-        if line is None or line == "":
-            break
+    # With parallel streams, the lines of one interval are followed by a SUM line
+    # and sent together. Without, each line is sent directly, since InfluxDB 
+    # timestamps are assigned on receive. When the caller does not know whether
+    # parallel streams are used (None, e.g., the server), the rows are buffered 
+    # until the first SUM line or the first line of the next interval.
+    interval_rows = []
+
+    def send_interval_rows():
+        if len(interval_rows) != 0:
+            interface.data_points(_LINE_PARSERS[mode][0], interval_rows)
+            interval_rows.clear()
+
+    # Read until EOF, lines buffered when iperf3 exits are still parsed
+    for raw_line in process.stdout:
+        line = raw_line.decode("utf-8")
 
         if pos == LogPosition.SUMMARY:
             continue
@@ -175,20 +198,23 @@ def run_iperf(cli: List[str], interface: GenericApplicationInterface,
             continue
         else:
             pos = LogPosition.RUNNING
-            preamble_finished = True
 
-        if pos == LogPosition.RUNNING and line.startswith("-") and not next_could_be_delimiter:
-            pos = LogPosition.SUMMARY
+        if pos == LogPosition.RUNNING and line.startswith("-"):
+            # With parallel streams, the separator after a SUM line is followed by
+            # the next interval or the summary header
+            if not next_could_be_delimiter:
+                pos = LogPosition.SUMMARY
+            
+            next_could_be_delimiter = False
             continue
 
         next_could_be_delimiter = False
 
-        if pos == LogPosition.RUNNING and "ID" in line and not preamble_finished:
+        # Header of the summary, the first header is used to detect the mode
+        if pos == LogPosition.RUNNING and "ID]" in line and mode != IPerfMode.UNKNOWN:
             pos = LogPosition.SUMMARY
             continue
 
-        preamble_finished = False
-
         if pos == LogPosition.RUNNING:
             if not line.startswith("["):
                 raise Exception("Invalid iperf3 log output!")
@@ -205,16 +231,10 @@ def run_iperf(cli: List[str], interface: GenericApplicationInterface,
                 continue
 
             # Do the real parsing
-            match_brackets = re.search(r'\[\s*(\d+|SUM)\s*\]', line)
-            stream = match_brackets.group(1) if match_brackets else None
-            if stream is None:
+            match_line = _STREAM_LINE_RE.match(line)
+            if match_line is None:
                 raise Exception("Unable to parse iperf3 logline!")
-
-            match_after_brackets = re.search(r'\]\s*(.*)', line)
-            everything_after_brackets = match_after_brackets.group(1) if match_after_brackets else None
-            if everything_after_brackets is None:
-                raise Exception("Unable to parse iperf3 logline!")
-            line = everything_after_brackets
+            stream, line = match_line.groups()
 
             line_parts = line.split()
             if len(line_parts) < 3:
@@ -225,21 +245,27 @@ def run_iperf(cli: List[str], interface: GenericApplicationInterface,
 
             if "SUM" in stream:
                 next_could_be_delimiter = True
+                parallel_streams = True
+                send_interval_rows()
                 continue
 
             stream = int(stream)
             line_parts = list(map(lambda x: x.strip(), line_parts))
 
-            match mode:
-                case IPerfMode.TCP_CLIENT:
-                    parse_line_tcp_client(interface, time_spec, stream, line_parts)
-                case IPerfMode.TCP_SERVER:
-                    parse_line_tcp_server(interface, time_spec, stream, line_parts)
-                case IPerfMode.UDP_CLIENT:
-                    parse_line_udp_client(interface, time_spec, stream, line_parts)
-                case IPerfMode.UDP_SERVER:
-                    parse_line_udp_server(interface, time_spec, stream, line_parts)
+            measurement, parser = _LINE_PARSERS[mode]
+            data = parser(time_spec, stream, line_parts)
+
+            if parallel_streams is None and len(interval_rows) != 0 \
+                    and interval_rows[0][0]["time"] != time_spec:
+                parallel_streams = False # Next interval without a SUM line
+                send_interval_rows()
+
+            if parallel_streams is False:
+                interface.data_point(measurement, data)
+            else:
+                interval_rows.append((data, None))
 
+    send_interval_rows() # Interval interrupted by the end of the output
     rc = process.wait()
     if rc != 0:
         raise Exception(process.stderr.readline().decode("utf-8"))
@@ -111,37 +111,38 @@ class PingApplication(BaseApplication):
         current_seq = 0
         try:
             while process.poll() is None:
-                line = process.stdout.readline().decode("utf-8")
+                # Parsed as bytes, int() and float() accept the extracted values directly
+                line = process.stdout.readline()
 
-                if line is None or line == "":
+                if line is None or line == b"":
                     break
 
-                if not line.startswith("["): 
+                if not line.startswith(b"["): 
                     continue
 
-                parts = line.split(" ")
+                parts = line.split(b" ")
                 #timestamp = float(parts.pop(0).replace("[", "").replace("]", ""))
                 parts.pop(0)
 
                 reachable = True
 
-                if parts[0] == "no" or parts[0] == "From":
+                if parts[0] == b"no" or parts[0] == b"From":
                     reachable = False
 
-                results = dict(map(lambda z: (z[0], z[1]), map(lambda y: y.split("="), filter(lambda x: "=" in x, parts))))
+                results = {key: value for key, _, value in (part.partition(b"=") for part in parts if b"=" in part)}
 
-                if "icmp_seq" not in results:
+                if b"icmp_seq" not in results:
                     continue
 
-                icmp_seq = int(results["icmp_seq"])
+                icmp_seq = int(results[b"icmp_seq"])
 
                 if current_seq >= icmp_seq:
                     continue
                 current_seq = icmp_seq
 
                 data = {
-                    "rtt": float(results.get("time", -1)),
-                    "ttl": int(results.get("ttl", -1)),
+                    "rtt": float(results.get(b"time", -1)),
+                    "ttl": int(results.get(b"ttl", -1)),
                     "reachable": reachable,
                     "icmp_seq": icmp_seq
                 }
@@ -35,9 +35,10 @@ The setting value "command" contains that path alongside with additional argumen
 It is possible to use expressions like '/bin/bash <script>'. The script or program
 should be executable. "environment" contains a key-value-dictionary that is passed
 as environment variables to the command or script. The script or command is 
-always terminated when the "timeout" is exceeded, the "ignore_timeout" setting can
-be used to define if that should be interpreted as a failure of this Application 
-and defaults to "false". Settings "environment" and "ignore_timeout" are optional.
+always terminated when the "timeout" is exceeded, including all processes started
+by it. The "ignore_timeout" setting can be used to define if that should be 
+interpreted as a failure of this Application and defaults to "false". Settings 
+"environment" and "ignore_timeout" are optional.
 
 Example config:
     {
@@ -113,15 +114,19 @@ class RunProgramApplication(BaseApplication):
         if self.settings is None:
             return False
 
+        # Only passed to the program, the environment of this process is not changed
+        env = None
         if self.settings.environment is not None:
+            env = dict(os.environ)
             for k, v in self.settings.environment.items():
-                os.environ[k] = str(v)
+                env[k] = str(v)
         
         status = None
         try:
             status = self.interface.run_command_and_stream(f"{self.command} {self.args}", 
                                                            shell=True, 
-                                                           timeout=(runtime))
+                                                           timeout=(runtime),
+                                                           env=env)
         except subprocess.TimeoutExpired as ex:
             if self.settings.ignore_timeout:
                 return True
@@ -18,6 +18,7 @@
 
 from abc import ABC
 from enum import Enum
+from dataclasses import dataclass, field
 
 from typing import Any, Optional, List
 
@@ -44,35 +45,39 @@ class AppStartStatus(Enum):
         return str(self.value)
 
 
+# eq=False: Configs are hashed by identity, e.g., as dependency graph nodes
+@dataclass(eq=False)
 class DependentAppStartConfig:
-    def __init__(self, at: str, instance: str, application: str) -> None:
-        self.at: AppStartStatus = AppStartStatus(at)
-        self.instance = instance
-        self.application = application
+    at: AppStartStatus
+    instance: str
+    application: str
 
+    def __post_init__(self) -> None:
+        self.at = AppStartStatus(self.at)
 
+
+@dataclass(eq=False)
 class ApplicationConfig(JSONMessage):
-    def __init__(self, name: str, application: str, delay: int = 0, 
-                 runtime: int = 30, dont_store: bool = False, 
-                 load_from_instance: bool = False, 
-                 depends = Optional[Any], settings = Optional[Any]) -> None:
-        if "@" in name:
-            raise Exception(f"Application name '{name}' contains the reserved '@' character.")
-
-        self.name: str = name
-        self.delay: int = delay
-        self.runtime: int = runtime
-        self.dont_store: bool = dont_store
-        self.application: str = application
-        self.load_from_instance: bool = load_from_instance
-        self.settings: ApplicationConfig = settings
-        self.depends: List[DependentAppStartConfig] | List[str] =  []
-
-        if isinstance(depends, list):
-            for start_config in depends:
-                self.depends.append(DependentAppStartConfig(**start_config))
-        elif isinstance(depends, dict):
-            self.depends.append(DependentAppStartConfig(**depends))
+    name: str
+    application: str
+    delay: int = 0
+    runtime: int = 30
+    dont_store: bool = False
+    load_from_instance: bool = False
+    # Given as dict or list of dicts in the config, converted in __post_init__
+    depends: List[DependentAppStartConfig] = field(default_factory=list)
+    settings: Optional[Any] = None
+
+    def __post_init__(self) -> None:
+        if "@" in self.name:
+            raise Exception(f"Application name '{self.name}' contains the reserved '@' character.")
+
+        if isinstance(self.depends, list):
+            self.depends = [DependentAppStartConfig(**start_config) for start_config in self.depends]
+        elif isinstance(self.depends, dict):
+            self.depends = [DependentAppStartConfig(**self.depends)]
+        else:
+            self.depends = []
 
     def __str__(self) -> str:
         return f"{self.name} ({self.application})"
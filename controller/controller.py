@@ -22,7 +22,7 @@ import time
 from pathlib import Path
 from loguru import logger
 from typing import List
-from threading import Event, Thread
+from threading import Event
 from enum import Enum
 
 from helper.network_helper import *
@@ -146,21 +146,8 @@ class Controller(Dismantable):
         if self.dismantables is None:
             return
         
-        async_dismantle = []
-        while len(self.dismantables) > 0:
-            dismantable = self.dismantables.pop(0)
-            try:
-                if not spawn_threads or not dismantable.dismantle_parallel():
-                    dismantable.dismantle(force)
-                else:
-                    thread = Thread(target=dismantable.dismantle, daemon=True, args=(force, ))
-                    thread.start()
-                    async_dismantle.append(thread)
-            except Exception as ex:
-                logger.opt(exception=ex).error(f"Unable to dismantle {dismantable.get_name()}")
-
-        for thread in async_dismantle:
-            thread.join()
+        dismantables, self.dismantables = self.dismantables, []
+        Dismantable.dismantle_all(dismantables, force, spawn_threads)
 
     def __del__(self):
         self._destroy(spawn_threads=False, force=True)
@@ -141,6 +141,7 @@ class IntegrationLoader:
 
 
 class IntegrationHelper(Dismantable):
+    __BARRIER_TIMEOUT = 10 # seconds for all start threads to come up
     def __init__(self, testbed_package_base: Optional[Path], app_base: str, provider: TestbedStateProvider, 
                  skip_integrations: bool = False, disabled: bool = False) -> None:
         self.provider = provider
@@ -156,13 +157,15 @@ class IntegrationHelper(Dismantable):
         }
 
     def apply_configured_integrations(self, integrations: List[Integration]):
-        if self.disabled and integrations is not None and len(integrations) != 0:
+        if self.disabled and integrations:
             raise Exception("Integrations are disabled by default settings, unable to execute testbed.")
 
-        self.loader.init_packaged_integrations()
+        # Type lookup is a dict probe, but filling the map imports every packaged module
+        if integrations:
+            self.loader.init_packaged_integrations()
         self.integrations = integrations
 
-        for integration in integrations:
+        for integration in integrations or []:
             integration_obj = self.loader.get_packaged_or_try_load(integration.type)
             if integration_obj is None:
                 raise Exception(f"Integration '{integration.name}' of type '{integration.type}' could not be loaded.")
@@ -204,7 +207,14 @@ class IntegrationHelper(Dismantable):
 
     def _fire_integration(self, exec: IntegrationExecutionWrapper, barrier: threading.Barrier):
         def integration_thread(exec: IntegrationExecutionWrapper, barrier: threading.Barrier):
-            barrier.wait()
+            try:
+                barrier.wait(IntegrationHelper.__BARRIER_TIMEOUT)
+            except threading.BrokenBarrierError as ex:
+                logger.error(f"Integration: Start of Integration '{exec.obj.name}' aborted, not all start threads came up")
+                exec.status.set_error(ex)
+                exec.status.set_finished()
+                return
+            
             exec.started_at = time.time()
 
             logger.trace(f"Integration: Calling start of Integration '{exec.obj.name}'")
@@ -295,7 +305,13 @@ class IntegrationHelper(Dismantable):
                     expected_max_timeout = sync_integration.impl.get_expected_timeout(at_shutdown=False)
                 self._fire_integration(sync_integration, sync_barrier)
             
-            sync_barrier.wait() # No interrupt handling -> Wait time is short!
+            # A start thread that never reaches the barrier must not block the testbed
+            try:
+                sync_barrier.wait(IntegrationHelper.__BARRIER_TIMEOUT)
+            except threading.BrokenBarrierError:
+                logger.critical("Integration: Not all blocking integration start threads came up")
+                return False
+            
             wait_until = time.time() + expected_max_timeout + 1
             logger.debug(f"Integration: Waiting {expected_max_timeout:.2f} seconds for start phase of blocking integrations to finish!")
             status = True
@@ -330,7 +346,11 @@ class IntegrationHelper(Dismantable):
             for async_integration in async_integrations:
                 self._fire_integration(async_integration, async_barrier)
 
-            async_barrier.wait() # No interrupt handling -> Wait time is short!
+            try:
+                async_barrier.wait(IntegrationHelper.__BARRIER_TIMEOUT)
+            except threading.BrokenBarrierError:
+                logger.critical("Integration: Not all non-blocking integration start threads came up")
+                return False
 
         if wait_after_invoked >= 0:
             logger.debug(f"Integration: Waiting {wait_after_invoked} seconds before proceeding.")
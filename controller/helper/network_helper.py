@@ -44,13 +44,13 @@ class NetworkBridge(Dismantable):
     def cleanup_interface(if_name: str, fail_silent: bool = False) -> bool:
         if if_name.startswith(BRIDGE_PREFIX):
             process = invoke_subprocess(["/usr/sbin/ip", "link", "set", "down", "dev", if_name], 
-                                        needs_root=True)
+                                        needs_root=True, stdout_devnull=True)
             if process.returncode != 0:
                 logger.error(f"Unable to set bridge '{if_name}' down: {process.stderr.decode('utf-8')}")
                 return False
 
             process = invoke_subprocess(["/usr/sbin/brctl", "delbr", if_name], 
-                                        needs_root=True)
+                                        needs_root=True, stdout_devnull=True)
             if process.returncode != 0:
                 logger.error(f"Unable to delete bridge '{if_name}': {process.stderr.decode('utf-8')}")
                 return False
@@ -58,13 +58,13 @@ class NetworkBridge(Dismantable):
             return True
         elif if_name.startswith(TAP_PREFIX):
             process = invoke_subprocess(["/usr/sbin/ip", "link", "set", "down", "dev", if_name], 
-                                        needs_root=True)
+                                        needs_root=True, stdout_devnull=True)
             if process.returncode != 0:
                 logger.error(f"Unable to set tap device '{if_name}' down: {process.stderr.decode('utf-8')}")
                 return False
 
             process = invoke_subprocess(["/usr/sbin/ip", "link", "del", "dev", if_name], 
-                                        needs_root=True)
+                                        needs_root=True, stdout_devnull=True)
             if process.returncode != 0:
                 logger.error(f"Unable to delete tap device '{if_name}': {process.stderr.decode('utf-8')}")
                 return False
@@ -77,7 +77,8 @@ class NetworkBridge(Dismantable):
 
     @staticmethod
     def check_interfaces_available(interfaces: List[str]):
-        return all(x in NetworkBridge.get_running_interfaces() for x in interfaces)
+        running_interfaces = set(NetworkBridge.get_running_interfaces())
+        return all(x in running_interfaces for x in interfaces)
     
     @staticmethod
     def generate_auto_management_network(seed: str, management_supernet: str) -> Optional[ipaddress.IPv4Network]:
@@ -113,7 +114,7 @@ class NetworkBridge(Dismantable):
         return False
     
     def _run_command(self, command: List[str]):
-        process = invoke_subprocess(command, needs_root=True)
+        process = invoke_subprocess(command, needs_root=True, stdout_devnull=True)
         if process.returncode != 0:
             logger.error(f"Network {self.name}: Command '{' '. join(command)}' failed: {process.stderr.decode('utf-8')}")
             return False
@@ -27,6 +27,7 @@ from pathlib import Path
 from constants import MACHINE_STATE_FILE, INTERCHANGE_DIR_PREFIX, EXPERIMENT_RESERVATION_DIR
 from utils.networking import InstanceInterface
 from utils.state_lock import StateLock
+from utils.system_commands import get_process_cmdline
 
 
 @dataclass
@@ -124,17 +125,11 @@ class StateFileReader:
 
     @staticmethod
     def is_process_running(state: InstanceStateFile) -> bool:
-        import psutil
-        try:
-            proc = psutil.Process(state.main_pid)
-            if proc is None:
-                return False
-            if not proc.is_running() or proc.status == psutil.STATUS_ZOMBIE:
-                return False
-            
-            return state.cmdline in ' '.join(proc.cmdline())
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
+        cmdline = get_process_cmdline(state.main_pid)
+        if not cmdline:
             return False
+            
+        return state.cmdline in cmdline
         
     @staticmethod
     def check_and_aquire_experiment(lock: StateLock, tag: str, basedir: str,
@@ -164,6 +159,8 @@ class StateFileReader:
                    filter_running: Optional[bool] = None) -> List[StateFileEntry]:
 
         result: List[StateFileEntry] = []
+        # All Instances of a testbed share the main_pid, check each process once
+        running_map: Dict[int, bool] = {}
         for state in self.files:
             if state.contents is None and (filter_running is not None and not filter_running):
                 result.append(state)
@@ -175,7 +172,11 @@ class StateFileReader:
                 continue
 
             if filter_running is not None:
-                is_running = StateFileReader.is_process_running(state.contents)
+                is_running = running_map.get(state.contents.main_pid, None)
+                if is_running is None:
+                    is_running = StateFileReader.is_process_running(state.contents)
+                    running_map[state.contents.main_pid] = is_running
+
                 if is_running and filter_running:
                     result.append(state)
                 elif not is_running and not filter_running:
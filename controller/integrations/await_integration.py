@@ -28,7 +28,7 @@ from base_integration import BaseIntegration, IntegrationStatusContainer
 from utils.state_provider import TestbedStateProvider
 
 
-@dataclass
+@dataclass(slots=True)
 class AwaitIntegrationSettings(IntegrationSettings):
     start_script: str
     wait_for_exit: int
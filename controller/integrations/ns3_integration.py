@@ -28,7 +28,7 @@ from utils.system_commands import invoke_subprocess
 from base_integration import BaseIntegration, IntegrationStatusContainer
 from utils.state_provider import TestbedStateProvider
 
-@dataclass
+@dataclass(slots=True)
 class NS3IntegrationSettings(IntegrationSettings):
     basepath: str
     program: str
@@ -85,12 +85,12 @@ class NS3Integration(BaseIntegration):
         # 1. Create new interfaces
         for interface in self.settings.interfaces:
             try:
-                sub_process = invoke_subprocess(["/usr/sbin/ip", "tuntap", "add", interface, "mode", "tap"])
+                sub_process = invoke_subprocess(["/usr/sbin/ip", "tuntap", "add", interface, "mode", "tap"], stdout_devnull=True)
                 if sub_process.returncode != 0:
                     self.status.set_error(f"Unable to create tap interface '{interface}': {sub_process.stderr.decode('utf-8')}")
                     return False
                 
-                sub_process = invoke_subprocess(["/usr/sbin/ip", "link", "set", "up", "dev", interface])
+                sub_process = invoke_subprocess(["/usr/sbin/ip", "link", "set", "up", "dev", interface], stdout_devnull=True)
                 if sub_process.returncode != 0:
                     self.status.set_error(f"Unable to set link '{interface}' up: {sub_process.stderr.decode('utf-8')}")
                     return False
@@ -125,7 +125,7 @@ class NS3Integration(BaseIntegration):
         got_error = False
         for interface in self.settings.interfaces:
             try:
-                sub_process = invoke_subprocess(["/usr/sbin/ip", "link", "del", interface])
+                sub_process = invoke_subprocess(["/usr/sbin/ip", "link", "del", interface], stdout_devnull=True)
                 if sub_process.returncode != 0:
                     logger.error(f"ns-3 Integration {self.name}: Unable to delete tap interface '{interface}': {sub_process.stderr.decode('utf-8')}")
                     got_error = True
@@ -28,7 +28,7 @@ from base_integration import BaseIntegration, IntegrationStatusContainer
 from utils.state_provider import TestbedStateProvider
 
 
-@dataclass
+@dataclass(slots=True)
 class StartStopIntegrationSettings(IntegrationSettings):
     start_script: str
     stop_script: str
@@ -36,6 +36,18 @@ import state_manager
 from state_manager import AgentManagementState
 
 
+# Loguru level and message prefix for each message type received from the Instances
+_LOGGER_LEVELS = {
+    LogMessageType.MSG_SUCCESS: ("SUCCESS", ""),
+    LogMessageType.MSG_INFO: ("INFO", ""),
+    LogMessageType.MSG_DEBUG: ("DEBUG", ""),
+    LogMessageType.MSG_WARNING: ("WARNING", ""),
+    LogMessageType.MSG_ERROR: ("ERROR", ""),
+    LogMessageType.STDERR: ("INFO", "<y>STDERR:</y> "),
+    LogMessageType.STDOUT: ("INFO", "<y>STDOUT:</y> "),
+}
+
+
 class ManagementClientConnection(threading.Thread):
     __MAX_FRAME_LEN = 8192
 
@@ -64,21 +76,12 @@ class ManagementClientConnection(threading.Thread):
 
     @staticmethod
     def _message_type_to_logger(type: LogMessageType, message: str, prefix: Optional[str]) -> None:
-        match type:
-            case LogMessageType.MSG_SUCCESS:
-                logger.opt(ansi=True).success(f"{prefix} {message}")
-            case LogMessageType.MSG_INFO:
-                logger.opt(ansi=True).info(f"{prefix} {message}")
-            case LogMessageType.MSG_DEBUG:
-                logger.opt(ansi=True).debug(f"{prefix} {message}")
-            case LogMessageType.MSG_WARNING:
-                logger.opt(ansi=True).warning(f"{prefix} {message}")
-            case LogMessageType.MSG_ERROR:
-                logger.opt(ansi=True).error(f"{prefix} {message}")
-            case LogMessageType.STDERR:
-                logger.opt(ansi=True).info(f"{prefix} <y>STDERR:</y> {message}")
-            case LogMessageType.STDOUT:
-                logger.opt(ansi=True).info(f"{prefix} <y>STDOUT:</y> {message}")
+        mapping = _LOGGER_LEVELS.get(type)
+        if mapping is None:
+            return
+        
+        level, type_prefix = mapping
+        logger.opt(ansi=True).log(level, f"{prefix} {type_prefix}{message}")
 
     def _process_one_message(self, data) -> bool:
         message_obj: Optional[InstanceManagerMessageDownstream] = None
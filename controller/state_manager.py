@@ -30,7 +30,7 @@ from typing import Tuple, Optional, List, Dict
 from threading import Lock, Semaphore, Event
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from utils.system_commands import invoke_subprocess, set_owner
+from utils.system_commands import invoke_subprocess, set_owners
 from helper.file_copy_helper import FileCopyHelper
 from helper.app_dependency_helper import AppDependencyHelper
 from utils.networking import InstanceInterface
@@ -200,9 +200,11 @@ class InstanceState:
         os.makedirs(self.interchange_dir / INSTANCE_INTERCHANGE_DIR_MOUNT, exist_ok=True)
         self.interchange_ready = True
 
-    def remove_interchange_dir(self, file_preservation: Optional[Path], fully_delete: bool = True) -> None:
+    # Returns the preservation target, ownership is set by the caller for all Instances at once
+    def remove_interchange_dir(self, file_preservation: Optional[Path], fully_delete: bool = True) -> Optional[Path]:
+        preserved: Optional[Path] = None
         if not self.interchange_ready:
-            return
+            return preserved
         
         if file_preservation is not None:
             # Clean pending copy jobs, so that they are not copied to the testbed results
@@ -218,8 +220,7 @@ class InstanceState:
                 target = file_preservation / self.name
                 target.mkdir(parents=True, exist_ok=True)
                 shutil.copytree(self.get_p9_data_path(), target, dirs_exist_ok=True)
-                if self.provider.executor is not None:
-                    set_owner(target, self.provider.executor)
+                preserved = target
 
                 if self.provider.result_wrapper is not None:
                     self.provider.result_wrapper.add_instance_preserved_files(self.name, target, len(flist))
@@ -237,6 +238,8 @@ class InstanceState:
                         shutil.rmtree(content)
                     else:
                         content.unlink()
+        
+        return preserved
 
     def get_mgmt_socket_path(self) -> None | Path:
         if not self.interchange_ready or self.vsock_cid is not None:
@@ -265,7 +268,7 @@ class InstanceState:
         while time.time() <= wait_until:
             for scope in scope_sockets:
                 if os.path.exists(scope):
-                    process = invoke_subprocess(["chmod", "777", str(scope)], needs_root=True)
+                    process = invoke_subprocess(["chmod", "777", str(scope)], needs_root=True, stdout_devnull=True)
 
                     if process.returncode != 0:
                         raise Exception(f"Unable to change permissions of socket {scope}")
@@ -443,10 +446,16 @@ class InstanceStateManager(Dismantable):
             self.external_interrupt_signal.set()
             self.state_change_semaphore.release(n=len(self.map))
 
+        preserved: List[Path] = []
         for instance in self.map.values():
-            instance.remove_interchange_dir(self.provider.preserve)
+            target = instance.remove_interchange_dir(self.provider.preserve)
+            if target is not None:
+                preserved.append(target)
             instance.disconnect()
         
+        if self.provider.executor is not None:
+            set_owners(preserved, self.provider.executor)
+        
         try:
             os.rmdir(self.provider.statefile_base / Path(self.provider.unique_run_name))
         except Exception:
@@ -455,8 +464,14 @@ class InstanceStateManager(Dismantable):
         self.map.clear()
 
     def copy_preserve_files(self, preserve_target: Optional[Path]) -> None:
+        preserved: List[Path] = []
         for instance in self.map.values():
-            instance.remove_interchange_dir(preserve_target, False)
+            target = instance.remove_interchange_dir(preserve_target, False)
+            if target is not None:
+                preserved.append(target)
+        
+        if self.provider.executor is not None:
+            set_owners(preserved, self.provider.executor)
 
     def reset_all_after_snapshot_restore(self):
         for instance in self.map.values():
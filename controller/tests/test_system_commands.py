@@ -0,0 +1,56 @@
+#
+# This file is part of Proto²Testbed.
+#
+# Copyright (C) 2025 Martin Ottens
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+#
+
+import sys
+import unittest
+
+from pathlib import Path
+from unittest.mock import patch, mock_open
+
+# Same import paths as the controller
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.system_commands import get_dns_resolver
+
+
+class GetDNSResolverTest(unittest.TestCase):
+    def resolve(self, resolv_conf: str) -> str:
+        get_dns_resolver.cache_clear()
+        try:
+            with patch("builtins.open", mock_open(read_data=resolv_conf)):
+                return get_dns_resolver()
+        finally:
+            get_dns_resolver.cache_clear()
+
+    def test_first_ipv4_nameserver(self):
+        resolv_conf = "# Generated\nsearch example.org\nnameserver fd00::1\nnameserver 10.0.0.1\nnameserver 10.0.0.2\n"
+        self.assertEqual(self.resolve(resolv_conf), "10.0.0.1")
+
+    def test_indented_without_newline(self):
+        self.assertEqual(self.resolve("  nameserver\t192.168.1.53"), "192.168.1.53")
+
+    def test_trailing_comment(self):
+        self.assertEqual(self.resolve("nameserver 10.0.0.1 # corp dns\n"), "10.0.0.1")
+
+    def test_no_ipv4_nameserver(self):
+        with self.assertRaises(Exception):
+            self.resolve("nameserver fd00::1\nnameserver 10.0.0.1.5\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
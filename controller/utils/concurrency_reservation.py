@@ -19,13 +19,14 @@
 import jsonpickle
 import os
 import random
-import string
+import secrets
 import socket
 import errno
+import time
 
 from loguru import logger
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Set, Optional
 
 from helper.network_helper import NetworkBridge
 from constants import *
@@ -41,11 +42,15 @@ class ReservationMapping:
 
 
 class ConcurrencyReservation:
+    __INTERFACE_CACHE_TTL = 2 # seconds
+
     def __init__(self, provider) -> None:
         self.provider = provider
         self.current_reservation = ReservationMapping()
         self.all_cpu_cores = 0
         self.all_memory_mb = 0
+        self._interface_cache: Set[str] = set()
+        self._interface_cache_updated: Optional[float] = None
         self._get_system_capacity()
 
     def _write_reservation(self) -> None:
@@ -115,6 +120,34 @@ class ConcurrencyReservation:
         logger.debug(f"Host system usage after start: {reservations.cpu_cores + cpu_cores}/{self.all_cpu_cores} cores, {reservations.memory_mb + memory_mb}/{self.all_memory_mb} MB memory")
         return True
 
+    def _get_host_interfaces(self) -> Set[str]:
+        now = time.monotonic()
+        if (self._interface_cache_updated is None 
+            or now - self._interface_cache_updated > ConcurrencyReservation.__INTERFACE_CACHE_TTL):
+            self._interface_cache = set(NetworkBridge.get_running_interfaces())
+            self._interface_cache_updated = now
+
+        return self._interface_cache
+
+    def _generate_interface_names(self, prefix: str, reserved: List[str], count: int) -> List[str]:
+        # Host interfaces are cached shortly, candidates are then checked in-memory
+        blocked = set(reserved)
+        blocked.update(self._get_host_interfaces())
+
+        names: List[str] = []
+        while len(names) < count:
+            # 6 random bytes yield 8 URL-safe chars, prefix + name stays below IFNAMSIZ
+            choice = prefix + secrets.token_urlsafe(6)
+            if choice in blocked:
+                continue
+
+            blocked.add(choice)
+            names.append(choice)
+
+        # Names will be created soon, keep cache in sync until next refresh
+        self._interface_cache.update(names)
+        return names
+
     def generate_new_tap_names(self, count: int = 1) -> List[str]:
         tap_names: List[str] = []
 
@@ -123,16 +156,7 @@ class ConcurrencyReservation:
 
         with self.provider.state_lock:
             reservations = self._collect_all_reservations()
-
-            for _ in range(count):
-                while True:
-                    choice = TAP_PREFIX + "".join(random.choices(string.ascii_letters + string.digits, k=8))
-                    if choice not in reservations.tap_interfaces:
-                        tap_names.append(choice)
-                        break
-
-            if NetworkBridge.check_interfaces_available(tap_names):
-                raise Exception(f"TAP interfaces from {tap_names} are not reserved but exist on the system!")
+            tap_names = self._generate_interface_names(TAP_PREFIX, reservations.tap_interfaces, count)
                 
             self.current_reservation.tap_interfaces.extend(tap_names)
             self._write_reservation()
@@ -196,16 +220,7 @@ class ConcurrencyReservation:
 
         with self.provider.state_lock:
             reservations = self._collect_all_reservations()
-
-            for _ in range(count):
-                while True:
-                    choice = BRIDGE_PREFIX + "".join(random.choices(string.ascii_letters + string.digits, k=8))
-                    if choice not in reservations.bridge_interfaces:
-                        bridge_names.append(choice)
-                        break
-
-            if NetworkBridge.check_interfaces_available(bridge_names):
-                raise Exception(f"Bridge interfaces from {bridge_names} are not reserved but exist on the system!")
+            bridge_names = self._generate_interface_names(BRIDGE_PREFIX, reservations.bridge_interfaces, count)
                 
             self.current_reservation.bridge_interfaces.extend(bridge_names)
             self._write_reservation()
@@ -16,21 +16,28 @@
 # along with this program. If not, see https://www.gnu.org/licenses/.
 #
 
-import json
 import stat
 import os
 import re
 
 from pathlib import Path
+from functools import lru_cache
 from loguru import logger
 from jsonschema import validate
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Dict, Any
 
 import state_manager
 from utils.settings import *
 from utils.system_commands import get_asset_relative_to, set_owner, invoke_subprocess
 
 
+@lru_cache(maxsize=1)
+def _load_config_schema() -> Dict[str, Any]:
+    # Static asset, parse it only once, e.g., for repeated API calls
+    with open(get_asset_relative_to(__file__, "../assets/config.schema.json"), "rb") as handle:
+        return json_loads(handle.read())
+
+
 def load_config(config_path: Path, skip_substitution: bool = False) -> TestbedConfig:
     if not config_path.exists():
         raise Exception("Unable to find 'testbed.json' in given setup.")
@@ -66,20 +73,17 @@ def load_config(config_path: Path, skip_substitution: bool = False) -> TestbedCo
             logger.info(f"Replaced {total_replaced} placeholder variables in config.")
 
     try:
-        config =  json.loads(config_str)
+        config = json_loads(config_str)
     except Exception as ex:
         raise Exception(f"Unable to parse contents from config '{config_path}'") from ex
 
-    with open(get_asset_relative_to(__file__, "../assets/config.schema.json"), "r") as handle:
-        schema = json.load(handle)
-
     try:
-        validate(instance=config, schema=schema)
+        validate(instance=config, schema=_load_config_schema())
     except Exception as ex:
         logger.opt(exception=ex).critical("Unable to validate config scheme")
         raise Exception(f"Unable to parse config '{config_path}'")
     
-    return TestbedConfig(config)
+    return TestbedConfig.from_json(config)
 
 
 def load_vm_initialization(config: TestbedConfig, base_path: Path, state_manager: state_manager.InstanceStateManager) -> bool:
@@ -17,6 +17,7 @@
 #
 
 import os
+import time
 import threading
 import queue
 import base64
@@ -54,17 +55,36 @@ class InfluxDBAdapter(Dismantable):
         
         logger.debug("InfluxDBAdapter: InfluxDB Insert Thread started.")
         
-        while True:
-            point = self._queue.get()
-            if point is None:
-                logger.debug("InfluxDBAdapter: Stopping Insert Thread.")
-                break
-                
+        # Points are buffered and written in batches, a batch is flushed when it
+        # is full, after flush_interval seconds or when the thread is stopped
+        buffer = []
+        last_flush = time.monotonic()
+        stopping = False
+        while not stopping:
+            try:
+                points = self._queue.get(timeout=max(0, self.flush_interval - (time.monotonic() - last_flush)))
+                if points is None:
+                    logger.debug("InfluxDBAdapter: Stopping Insert Thread.")
+                    stopping = True
+                else:
+                    buffer.extend(points)
+            except queue.Empty:
+                pass
+
+            if not stopping and len(buffer) < self.batch_size \
+                    and time.monotonic() - last_flush < self.flush_interval:
+                continue
+            
+            last_flush = time.monotonic()
+            if len(buffer) == 0:
+                continue
+
             try:
-                client.write_points(point, time_precision="ms")
-                logger.trace(f"InfluxDBAdapter: Wrote data point {point}")
+                client.write_points(buffer, time_precision="n", batch_size=self.batch_size)
+                logger.trace(f"InfluxDBAdapter: Wrote {len(buffer)} data points")
             except Exception as ex:
-                logger.opt(exception=ex).warning("InfluxDBAdapter: Unable to write datapoint")
+                logger.opt(exception=ex).warning(f"InfluxDBAdapter: Unable to write {len(buffer)} datapoints")
+            buffer = []
         
         client.close()
 
@@ -128,6 +148,8 @@ class InfluxDBAdapter(Dismantable):
                                    provider.default_configs.get_defaults("influx_password", None))
         self.timeout = int(provider.default_configs.get_defaults("influx_timeout", 20))
         self.retries = int(provider.default_configs.get_defaults("influx_retries", 4))
+        self.batch_size = int(provider.default_configs.get_defaults("influx_batch_size", 500))
+        self.flush_interval = float(provider.default_configs.get_defaults("influx_flush_interval", 1.0))
 
         if not self._check_connection():
             raise Exception("InfluxDBAdapter: Unable to verify InfluxDB connection!")
@@ -157,20 +179,23 @@ class InfluxDBAdapter(Dismantable):
             logger.trace(f"InfluxDBAdapter: Store disabled for data point '{point}'")
             return True
         
+        # Instances may report several points of one series at once
         try:
-            point[0]["tags"]["experiment"] = self.provider.experiment
-
-            hashstr = ""
-            for tag_value in point[0]["tags"].values():
-                hashstr += str(tag_value)
-            hash_value = hashlib.sha256(hashstr.encode("utf-8"))
-            point[0]["tags"]["hash"] = base64.urlsafe_b64encode(hash_value.digest())[0:16]
+            for single_point in point:
+                single_point["tags"]["experiment"] = self.provider.experiment
+
+                hashstr = ""
+                for tag_value in single_point["tags"].values():
+                    hashstr += str(tag_value)
+                hash_value = hashlib.sha256(hashstr.encode("utf-8"))
+                single_point["tags"]["hash"] = base64.urlsafe_b64encode(hash_value.digest())[0:16]
         except Exception:
             logger.warning("InfluxDBAdapter: Unable to add experiment tag to data point, skipping insert.")
             return False
         
         if self.full_result_wrapper is not None:
-            self.full_result_wrapper.add_data_point(point[0])
+            for single_point in point:
+                self.full_result_wrapper.add_data_point(single_point)
             return True
 
         with self._lock:
@@ -180,6 +205,14 @@ class InfluxDBAdapter(Dismantable):
             if point is None:
                 raise Exception("Invalid point: Got 'None'")
             
+            # Points are written delayed, so the receive time is used instead of the
+            # time assigned by InfluxDB. Otherwise, a batch would share one timestamp.
+            # Nanoseconds and an offset per point, points with the same tags (e.g., 
+            # several iperf3 streams) would overwrite each other otherwise.
+            received_at = time.time_ns()
+            for index, single_point in enumerate(point):
+                single_point.setdefault("time", received_at + index)
+            
             self._queue.put(point)
     
         return True
@@ -199,8 +232,8 @@ class InfluxDBAdapter(Dismantable):
             return
 
         with self._lock:
-            self._running = True
-            self._queue.put(None) # Poison Pill
+            self._running = False
+            self._queue.put(None) # Poison Pill, flushes buffered points
         self._thread.join()
 
     def get_name(self) -> str:
@@ -17,6 +17,9 @@
 #
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from loguru import logger
 
 
 class NamedInstance(ABC):
@@ -32,3 +35,26 @@ class Dismantable(NamedInstance):
 
     def dismantle_parallel(self) -> bool:
         return False
+
+    @staticmethod
+    def dismantle_all(dismantables: List["Dismantable"], force: bool = False, 
+                      spawn_threads: bool = True) -> None:
+        def dismantle_one(dismantable: Dismantable) -> None:
+            try:
+                dismantable.dismantle(force)
+            except Exception as ex:
+                logger.opt(exception=ex).error(f"Unable to dismantle {dismantable.get_name()}")
+
+        parallel = [spawn_threads and x.dismantle_parallel() for x in dismantables]
+        if not any(parallel):
+            for dismantable in dismantables:
+                dismantle_one(dismantable)
+            return
+
+        # Keep order: Parallel ones are started, sequential ones run in the meantime
+        with ThreadPoolExecutor(max_workers=min(32, sum(parallel))) as executor:
+            for dismantable, is_parallel in zip(dismantables, parallel):
+                if is_parallel:
+                    executor.submit(dismantle_one, dismantable)
+                else:
+                    dismantle_one(dismantable)
@@ -17,6 +17,7 @@
 #
 
 from typing import Optional, List, Dict, Any
+from operator import attrgetter
 
 from helper.network_helper import NetworkBridge
 
@@ -33,7 +34,23 @@ class BridgeMapping:
 
 class InstanceInterface:
 
-    _EXPORT_ATTRIBUTES = [
+    __slots__ = (
+        "tap_index",
+        "tap_dev",
+        "tap_mac",
+        "netmodel",
+        "vhost_enabled",
+        "bridge",
+        "bridge_attached",
+        "interface_on_instance",
+        "is_management_interface",
+        "instance",
+        "bridge_name",
+        "bridge_dev",
+        "host_ports"
+    )
+
+    _EXPORT_ATTRIBUTES = (
         "tap_index",
         "tap_dev",
         "tap_mac",
@@ -42,7 +59,9 @@ class InstanceInterface:
         "bridge_dev",
         "interface_on_instance",
         "is_management_interface"
-    ]
+    )
+    _EXPORT_SET = frozenset(_EXPORT_ATTRIBUTES)
+    _EXPORT_GET = attrgetter(*_EXPORT_ATTRIBUTES)
 
     def __init__(self, tap_index: int, 
                  tap_dev: Optional[str] = None,
@@ -77,8 +96,9 @@ class InstanceInterface:
             self.host_ports = host_ports
 
     def check_export_values(self) -> Optional[str]:
-        for attr in InstanceInterface._EXPORT_ATTRIBUTES:
-            if getattr(self, attr) is None:
+        values = InstanceInterface._EXPORT_GET(self)
+        for attr, value in zip(InstanceInterface._EXPORT_ATTRIBUTES, values):
+            if value is None:
                 return f"Attribute {attr} is not set!"
         
         return None
@@ -87,19 +107,14 @@ class InstanceInterface:
         return self.tap_index < other.tap_index
     
     def __getstate__(self):
-        state = self.__dict__.copy()
-        delkeys = []
-        for val in state.keys():
-            if val not in InstanceInterface._EXPORT_ATTRIBUTES:
-                delkeys.append(val)
-
-        for attr in delkeys:
-            del state[attr]
-
-        return state
+        # No __dict__ with slots, state stays a dict to keep state files readable
+        return dict(zip(InstanceInterface._EXPORT_ATTRIBUTES, InstanceInterface._EXPORT_GET(self)))
 
     def __setstate__(self, state):
-        self.__dict__.update(state)
+        # Unknown keys from foreign state files have no slot, skip them
+        for attr, value in state.items():
+            if attr in InstanceInterface._EXPORT_SET:
+                setattr(self, attr, value)
 
 
 class NetworkMappingHelper:
@@ -107,7 +122,7 @@ class NetworkMappingHelper:
         self.bridge_map: Dict[str, BridgeMapping] = {}
 
     def add_bridge_mapping(self, config_name: str, bridge_name: str) -> BridgeMapping:
-        if config_name in self.bridge_map.keys():
+        if config_name in self.bridge_map:
             raise Exception(f"Bridge {config_name} already mapped.")
 
         mapping = BridgeMapping(config_name, bridge_name)
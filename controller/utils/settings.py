@@ -22,15 +22,25 @@ import re
 
 from typing import List, Dict, Optional, Any
 from enum import Enum
-from abc import ABC
-from dataclasses import dataclass
+from functools import cached_property
+from dataclasses import dataclass, field, fields, is_dataclass
 from loguru import logger
 from json import JSONEncoder
 
 from common.application_configs import ApplicationConfig
 
 
-@dataclass
+try:
+    # Optional, considerably faster for large testbed configs
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+_MAC_RE = re.compile(r'([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}')
+
+
+@dataclass(slots=True)
 class TestbedSettings:
     management_network: Optional[str] = None
     diskimage_basepath: str = "./"
@@ -42,17 +52,17 @@ class TestbedSettings:
     allow_gso_gro: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class TestbedNetwork:
     name: str
     host_ports: List[str] = None
 
 
-class IntegrationSettings(ABC):
-    pass
+class IntegrationSettings:
+    __slots__ = ()
     
 
-class InvokeIntegrationAfter(Enum):
+class InvokeIntegrationAfter(str, Enum):
     STARTUP = "startup"
     NETWORK = "network"
     INIT = "init"
@@ -60,34 +70,45 @@ class InvokeIntegrationAfter(Enum):
     def __str__(self) -> str:
         return str(self.value)
     
+    @classmethod
+    def parse(cls, value: str) -> "InvokeIntegrationAfter":
+        # Members compare equal to their values, so both are accepted
+        try:
+            return _INVOKE_AFTER_BY_VALUE[value]
+        except KeyError:
+            raise ValueError(f"'{value}' is not a valid {cls.__name__}")
 
+
+_INVOKE_AFTER_BY_VALUE = {member.value: member for member in InvokeIntegrationAfter}
+    
+
+@dataclass(slots=True)
 class Integration:
-    def __init__(self, name: str, type: str, environment: Optional[Dict[str, str]] = None,
-                 invoke_after: str = str(InvokeIntegrationAfter.STARTUP), wait_after_invoke: int = 0,
-                 settings: Optional[Any] = None) -> None:
+    name: str
+    type: str
+    environment: Optional[Dict[str, str]] = None
+    invoke_after: InvokeIntegrationAfter = InvokeIntegrationAfter.STARTUP
+    wait_after_invoke: int = 0
+    settings: Optional[Any] = None
 
-        self.name = name
-        self.type = type
-        self.environment = environment
-        self.invoke_after: InvokeIntegrationAfter = InvokeIntegrationAfter(invoke_after)
-        self.wait_after_invoke = wait_after_invoke
-        self.settings: IntegrationSettings = settings
+    def __post_init__(self) -> None:
+        self.invoke_after = InvokeIntegrationAfter.parse(self.invoke_after)
 
     def __str__(self) -> str:
         return f"{self.name} ({self.type})"
 
 
+@dataclass(slots=True)
 class AttachedNetwork:
-    def __init__(self, name: str, mac: Optional[str] = None, 
-                 netmodel: str = "virtio", vhost: bool = True) -> None:
-        self.name: str = name
-        self.mac: Optional[str] = mac
-        self.netmodel: str = netmodel
-        self.vhost: bool = vhost
+    name: str
+    mac: Optional[str] = None
+    netmodel: str = "virtio"
+    vhost: bool = True
 
+    def __post_init__(self) -> None:
         if self.mac is not None:
-            if re.fullmatch(r'^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$', self.mac) is None:
-                raise Exception(f"MAC address '{self.mac}' (attached to network {name}) is invalid!")
+            if _MAC_RE.fullmatch(self.mac) is None:
+                raise Exception(f"MAC address '{self.mac}' (attached to network {self.name}) is invalid!")
 
     def __str__(self) -> str:
         return self.name
@@ -100,38 +121,27 @@ class AttachedNetwork:
                 and self.netmodel == other.netmodel and self.vhost == other.vhost)
 
 
+@dataclass(slots=True)
 class TestbedInstance:
-    def __init__(self, name: str, diskimage: str, setup_script: str = None, 
-                 environment: Optional[Dict[str, str]] =  None, cores: int = 2, 
-                 memory: int = 1024, management_address: Optional[str] = None, 
-                 networks: Optional[List[Any]] = None, applications = None, 
-                 preserve_files: Optional[List[str]] = None) -> None:
-
-        if "@" in name:
-            raise Exception(f"Instance name '{name}' contains the reserved '@' character.")
-        
-        self.name: str = name
-        self.diskimage: str = diskimage
-        self.setup_script: str = setup_script
-        self.environment: Dict[str, str] = environment
-        self.cores: int = cores
-        self.memory: int = memory
-        self.preserve_files: List[str] = preserve_files
-        self.management_address = management_address
-        self.networks: List[AttachedNetwork] = []
-
-        self.applications: List[ApplicationConfig] = []
-        for network in networks:
-            if isinstance(network, str):
-                self.networks.append(AttachedNetwork(network, None))
-            else:
-                self.networks.append(AttachedNetwork(**network))
-
-        if applications is None:
-            return
-
-        for application in applications:
-            self.applications.append(ApplicationConfig(**application))
+    name: str
+    diskimage: str
+    setup_script: Optional[str] = None
+    environment: Optional[Dict[str, str]] = None
+    cores: int = 2
+    memory: int = 1024
+    management_address: Optional[str] = None
+    networks: List[AttachedNetwork] = None
+    applications: List[ApplicationConfig] = None
+    preserve_files: Optional[List[str]] = None
+
+    def __post_init__(self) -> None:
+        if "@" in self.name:
+            raise Exception(f"Instance name '{self.name}' contains the reserved '@' character.")
+
+        # Raw JSON lists are converted into their config objects
+        self.networks = [AttachedNetwork(network, None) if isinstance(network, str) else AttachedNetwork(**network) 
+                         for network in self.networks]
+        self.applications = [ApplicationConfig(**application) for application in (self.applications or ())]
     
     def __str__(self) -> str:
         return self.name
@@ -165,21 +175,19 @@ class TestbedInstance:
         return True
 
 
+@dataclass(slots=True)
 class TestbedConfig:
-    def __init__(self, json_dict) -> None:
-        self.settings: TestbedSettings = TestbedSettings(**json_dict["settings"])
-        self.networks: List[TestbedNetwork] = []
-        self.instances: List[TestbedInstance] = []
-        self.integrations: List[Integration] = []
-
-        for network in json_dict["networks"]:
-            self.networks.append(TestbedNetwork(**network))
-        
-        for integration in json_dict["integrations"]:
-            self.integrations.append(Integration(**integration))
-
-        for instance in json_dict["instances"]:
-            self.instances.append(TestbedInstance(**instance))
+    settings: TestbedSettings
+    networks: List[TestbedNetwork] = field(default_factory=list)
+    instances: List[TestbedInstance] = field(default_factory=list)
+    integrations: List[Integration] = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, json_dict) -> "TestbedConfig":
+        return cls(settings=TestbedSettings(**json_dict["settings"]), 
+                   networks=[TestbedNetwork(**network) for network in json_dict["networks"]], 
+                   instances=[TestbedInstance(**instance) for instance in json_dict["instances"]], 
+                   integrations=[Integration(**integration) for integration in json_dict["integrations"]])
 
     def is_identical_besides_experiments(self, other) -> bool:
         if not isinstance(other, TestbedConfig):
@@ -191,6 +199,10 @@ class TestbedConfig:
         def normalize(obj):
             class CloseEncoder(JSONEncoder):
                 def default(self, o):
+                    if isinstance(o, Enum):
+                        return o.value
+                    if is_dataclass(o): # Slotted, no __dict__
+                        return {f.name: getattr(o, f.name) for f in fields(o)}
                     return o.__dict__
 
             return json.dumps(obj, sort_keys=True, cls=CloseEncoder)
@@ -229,18 +241,25 @@ class TestbedConfig:
 
 
 class DefaultConfigs:
+    __MISSING = object() # null is a valid default value
+
     def __init__(self, path: str) -> None:
-        self.defaults = {}
-        if not os.path.exists(path):
-            logger.debug(f"No default config in path '{path}' (or not readable)")
-            return
+        self.path = path
+
+    @cached_property
+    def defaults(self) -> Dict[str, Any]:
+        # Read on first lookup only
+        if not os.path.exists(self.path):
+            logger.debug(f"No default config in path '{self.path}' (or not readable)")
+            return {}
         
-        with open(path, "r") as handle:
-            self.defaults = json.load(handle)
+        with open(self.path, "rb") as handle:
+            return json_loads(handle.read())
 
     def get_defaults(self, key: str, fallback: Any = None):
-        if self.defaults is None or key not in self.defaults.keys():
+        value = self.defaults.get(key, DefaultConfigs.__MISSING) if self.defaults else DefaultConfigs.__MISSING
+        if value is DefaultConfigs.__MISSING:
             logger.debug(f"No default value for key '{key}' provided in config.")
             return fallback
-        else:
-            return self.defaults.get(key)
+        
+        return value
@@ -17,22 +17,53 @@
 #
 
 import os
+import fcntl
+import threading
 
-from filelock import FileLock
+from pathlib import Path
 
 from constants import GLOBAL_LOCKFILE
 
 
 class StateLock:
-    def __init__(self, statefile_base: str) -> None:
-        os.makedirs(statefile_base, exist_ok=True, mode=0o777)
-        self.lock = FileLock(statefile_base / GLOBAL_LOCKFILE)
+    __slots__ = ("fd", "thread_lock", "depth")
+
+    def __init__(self, statefile_base: Path | str) -> None:
+        statefile_base = Path(statefile_base)
+        if not statefile_base.is_dir():
+            os.makedirs(statefile_base, exist_ok=True, mode=0o777)
+
+        lockfile = statefile_base / GLOBAL_LOCKFILE
+        try:
+            self.fd = os.open(lockfile, os.O_CREAT | os.O_RDWR, 0o666)
+        except PermissionError:
+            # Lockfile created by another user, flock works on read-only fds
+            self.fd = os.open(lockfile, os.O_RDONLY)
+        
+        # flock is per open file, threads of this process are serialized here
+        self.thread_lock = threading.RLock()
+        self.depth = 0
     
     def lock_statefile(self) -> None:
-        self.lock.acquire()
+        self.thread_lock.acquire()
+        if self.depth == 0:
+            try:
+                fcntl.flock(self.fd, fcntl.LOCK_EX)
+            except Exception:
+                self.thread_lock.release()
+                raise
+        self.depth += 1
 
     def unlock_statefile(self) -> None:
-        self.lock.release()
+        self.depth -= 1
+        if self.depth == 0:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.thread_lock.release()
+
+    def __del__(self) -> None:
+        if getattr(self, "fd", None) is not None:
+            os.close(self.fd)
+            self.fd = None
 
     def __enter__(self):
         self.lock_statefile()
@@ -17,11 +17,10 @@
 #
 
 import os
-import psutil
-import random
-import string
+import secrets
 
 from pathlib import Path
+from functools import cached_property
 from typing import Optional
 
 from utils.settings import DefaultConfigs, TestbedConfig
@@ -33,23 +32,22 @@ from cli import CLI
 from full_result_wrapper import FullResultWrapper
 from constants import DEFAULT_CONFIG_PATH, DEFAULT_STATE_DIR
 from utils.config_tools import check_preserve_dir
+from utils.system_commands import get_process_cmdline
 
 
 class TestbedStateProvider:
+    __TAG_CANDIDATE_BATCH = 8 # tags per random draw
+
     def __init__(self, verbose: int, sudo: bool, 
                  from_api_call: bool = False, cache_datapoints: bool = False, 
                  preserve: Optional[Path] = None, also_log_stdout: bool = False) -> None:
 
-        self.default_configs = DefaultConfigs(DEFAULT_CONFIG_PATH)
-        self.statefile_base = Path(self.default_configs.get_defaults("statefile_basedir", DEFAULT_STATE_DIR))
-        
         original_uid = os.environ.get("SUDO_UID", None)
         if original_uid is None:
             original_uid = os.getuid()
         
         self.executor = int(original_uid)
         self.main_pid = os.getpid()
-        self.cmdline = " ".join(psutil.Process(self.main_pid).cmdline())
         self.app_base_path = Path(__file__).parent.parent.resolve()
         self.log_verbose = verbose
         self.sudo_mode = sudo
@@ -60,7 +58,6 @@ class TestbedStateProvider:
         self.unique_run_name = f"{self.main_pid}-{self.executor}"
         self.testbed_config: Optional[TestbedConfig] = None
         self.testbed_package_path: Optional[Path] = None
-        self.state_lock = StateLock(self.statefile_base)
         self.from_api_call = from_api_call
         self.cache_datapoints = cache_datapoints
         self.cli: Optional[CLI] = None
@@ -69,6 +66,27 @@ class TestbedStateProvider:
         self.snapshots_enabled: bool = False
         self.concurrency_reservation: ConcurrencyReservation = ConcurrencyReservation(self)
 
+    # Only resolved when needed, the provider is also created for commands that never use them
+    @cached_property
+    def default_configs(self) -> DefaultConfigs:
+        return DefaultConfigs(DEFAULT_CONFIG_PATH)
+    
+    @cached_property
+    def statefile_base(self) -> Path:
+        return Path(self.default_configs.get_defaults("statefile_basedir", DEFAULT_STATE_DIR))
+    
+    @cached_property
+    def state_lock(self) -> StateLock:
+        return StateLock(self.statefile_base)
+    
+    @cached_property
+    def cmdline(self) -> str:
+        cmdline = get_process_cmdline(self.main_pid)
+        if cmdline is None:
+            raise Exception(f"Unable to read cmdline of process {self.main_pid}")
+        
+        return cmdline
+
     def clear(self) -> None:
         self.concurrency_reservation.clear_reservations()
     
@@ -91,14 +109,17 @@ class TestbedStateProvider:
         else:
             self.experiment = experiment
             while self.experiment is None:
-                self.experiment = "".join(random.choices(string.ascii_letters + string.digits, k=8))
-                self.experiment_generated = True
-
-                if accuire and not StateFileReader.check_and_aquire_experiment(self.state_lock, 
-                                                                               self.experiment, 
-                                                                               self.statefile_base,
-                                                                               self.unique_run_name):
-                    self.experiment = None
+                # Hex only, a leading '-' from token_urlsafe would break CLI args
+                batch = secrets.token_hex(4 * TestbedStateProvider.__TAG_CANDIDATE_BATCH)
+                for offset in range(0, len(batch), 8):
+                    candidate = batch[offset:offset + 8]
+                    if not accuire or StateFileReader.check_and_aquire_experiment(self.state_lock, 
+                                                                                  candidate, 
+                                                                                  self.statefile_base,
+                                                                                  self.unique_run_name):
+                        self.experiment = candidate
+                        self.experiment_generated = True
+                        break
             
             return self.experiment
         
@@ -21,77 +21,203 @@ import pexpect
 import re
 import os
 import shutil
+import stat
+import fcntl
 
-from typing import List, Optional
+from typing import List, Optional, Iterable
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, Future
 from loguru import logger
 from pathlib import Path
 
 
+# Only the parent is cached, so different assets next to the same base share the lookup
+@lru_cache(maxsize=256)
+def _resolve_parent(base: str) -> str:
+    return str(Path(base).parent.resolve())
+
+
 def get_asset_relative_to(base, file) -> str:
-    return f"{Path(base).parent.resolve()}/{file}"
+    return f"{_resolve_parent(str(base))}/{file}"
+
+
+_SPACE_RE = re.compile(r' +')
 
 
 def log_trace(func):
     def wrap(*args, **kwargs):
+        # Command is only formatted when a sink accepts TRACE messages
         if args:
             if isinstance(args[0], str):
-                cmd = re.sub(' +', ' ', args[0])
-                logger.trace("Running command: " + cmd)
+                command = args[0]
+                logger.opt(lazy=True).trace("Running command: {}", lambda: _SPACE_RE.sub(' ', command))
             elif isinstance(args[0], list):
-                cmd = re.sub(' +', ' ', " ".join(args[0]))
-                logger.trace("Running command: " + cmd)
+                command = args[0]
+                logger.opt(lazy=True).trace("Running command: {}", lambda: _SPACE_RE.sub(' ', " ".join(command)))
 
         return func(*args, **kwargs)
     
     return wrap
 
 
+# The controller never changes its effective user
+_IS_ROOT = os.geteuid() == 0
+
+
+def _with_sudo(command: List[str] | str, needs_root: bool) -> List[str] | str:
+    if not needs_root or _IS_ROOT:
+        return command
+    
+    if isinstance(command, str):
+        return "sudo " + command
+    else:
+        return ["sudo"] + command
+
+
 @log_trace
-def invoke_subprocess(command: List[str] | str, capture_output: bool = True, shell: bool = False, needs_root: bool = False) -> subprocess.CompletedProcess:
-    needs_root = False if os.geteuid() == 0  else needs_root
-    if isinstance(command, str) and needs_root:
-        command = "sudo " + command
-    elif isinstance(command, list) and needs_root:
-        command = ["sudo"] + command
+def invoke_subprocess(command: List[str] | str, capture_output: bool = True, shell: bool = False, needs_root: bool = False,
+                      stdout_devnull: bool = False) -> subprocess.CompletedProcess:
+    # For callers that only check the returncode and stderr, no stdout pipe is needed
+    if stdout_devnull:
+        return subprocess.run(_with_sudo(command, needs_root), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, shell=shell)
     
-    return subprocess.run(command, capture_output=capture_output, shell=shell)
+    return subprocess.run(_with_sudo(command, needs_root), capture_output=capture_output, shell=shell)
 
 
 @log_trace
 def invoke_pexpect(command: List[str] | str, timeout: int = None, encoding: str = "utf-8", needs_root: bool = False) -> pexpect.spawn:
-    needs_root = False if os.geteuid() == 0  else needs_root
-    if isinstance(command, str) and needs_root:
-        command = "sudo " + command
-    elif isinstance(command, list) and needs_root:
-        command = ["sudo"] + command
+    return pexpect.spawn(_with_sudo(command, needs_root), timeout=timeout, encoding=encoding)
 
-    return pexpect.spawn(command, timeout=timeout, encoding=encoding)
 
+# Only IPv4 nameservers are usable for the Instances, trailing text is ignored like by glibc
+_NAMESERVER_RE = re.compile(r'^\s*nameserver\s+((?:\d{1,3}\.){3}\d{1,3})(?:\s|$)')
 
-def get_dns_resolver() -> str:
-    pattern = re.compile(r'^(\d{1,3}\.){3}\d{1,3}$')
-    process = invoke_subprocess(r"grep -oP '^\s*nameserver\s+\K\d{1,3}(\.\d{1,3}){3}' /etc/resolv.conf | head -n 1", shell=True, needs_root=False)
 
-    if process.returncode != 0:
-        raise Exception("Unable to get DNS resolver from /etc/resolv.conf")
-    
-    address = process.stdout.decode("utf-8")
-    if address == "" or not pattern.match(address):
-        raise Exception("Invalid results when getting DNS Resolver from /etc/resolv.conf - is an IPv4 resolver configured?")
+# resolv.conf rarely changes during a testbed run, failed lookups are not cached
+@lru_cache(maxsize=1)
+def get_dns_resolver() -> str:
+    try:
+        with open("/etc/resolv.conf", "r") as handle:
+            for line in handle:
+                match = _NAMESERVER_RE.match(line)
+                if match is not None:
+                    return match.group(1)
+    except OSError as ex:
+        raise Exception("Unable to get DNS resolver from /etc/resolv.conf") from ex
     
-    return address.replace("\n", "")
+    raise Exception("Invalid results when getting DNS Resolver from /etc/resolv.conf - is an IPv4 resolver configured?")
 
 
-def set_owner(path: Path | str, owner: int) -> bool:
-    proc = invoke_subprocess(["/usr/bin/chown", "-R", str(owner), str(path)], 
-                                     capture_output=True, shell=False, needs_root=True)
+def get_process_cmdline(pid: int) -> Optional[str]:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as handle:
+            raw = handle.read()
+    except OSError:
+        return None
+
+    # Arguments are NULL-terminated, zombie processes have an empty cmdline
+    return raw.rstrip(b"\x00").replace(b"\x00", b" ").decode("utf-8", errors="replace")
+
+
+def set_owners(paths: Iterable[Path | str], owner: int) -> bool:
+    paths = [str(path) for path in paths]
+    if len(paths) == 0:
+        return True
+    
+    if _IS_ROOT:
+        # Same as 'chown -R', but without spawning a process
+        try:
+            for path in paths:
+                os.chown(path, owner, -1, follow_symlinks=False)
+                for root, dirs, files in os.walk(path):
+                    for name in dirs + files:
+                        os.chown(os.path.join(root, name), owner, -1, follow_symlinks=False)
+        except OSError as ex:
+            logger.opt(exception=ex).error(f"Error running chown for {', '.join(paths)}")
+            return False
+        
+        return True
+
+    # One sudo invocation for all paths
+    proc = invoke_subprocess(["/usr/bin/chown", "-R", str(owner)] + paths, 
+                                     shell=False, needs_root=True, stdout_devnull=True)
     if proc.returncode != 0:
-        logger.error(f"Error running chmod for {path}: {proc.stderr.decode('utf-8')}")
+        logger.error(f"Error running chown for {', '.join(paths)}: {proc.stderr.decode('utf-8')}")
         return False
     
     return True
 
 
+def set_owner(path: Path | str, owner: int) -> bool:
+    return set_owners([path], owner)
+
+
+_FICLONE = 0x40049409 # from linux/fs.h
+
+
+def _fast_copy(source: Path | str, destination: Path | str) -> Path | str:
+    # Reflink or in-kernel copy, shutil.copy2 is used whenever that is not possible.
+    # Special files, copies onto the source itself and files that report no size 
+    # (e.g., from procfs) are left to copy2, nothing is opened before these checks.
+    try:
+        src_stat = os.stat(source)
+        use_copy2 = not stat.S_ISREG(src_stat.st_mode) or src_stat.st_size == 0 \
+            or (os.path.exists(destination) and os.path.samefile(source, destination))
+    except OSError:
+        use_copy2 = True
+    
+    if use_copy2:
+        return shutil.copy2(source, destination)
+
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            cloned = False
+            if src_stat.st_dev == os.fstat(dst.fileno()).st_dev:
+                try:
+                    fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+                    cloned = True
+                except OSError:
+                    pass # Filesystem without reflink support
+            
+            remaining = 0 if cloned else src_stat.st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        
+        shutil.copystat(source, destination)
+    except (AttributeError, OSError):
+        shutil.copy2(source, destination)
+    
+    return destination
+
+
+class _ParallelCopier(ThreadPoolExecutor):
+    __MAX_WORKERS = 8 # concurrent file copies per copytree
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=_ParallelCopier.__MAX_WORKERS)
+        self.futures: List[Future] = []
+
+    def copy(self, source: str, destination: str) -> str:
+        # Create the file while copytree walks, so that directory permissions
+        # and timestamps applied afterwards are not affected by the workers
+        open(destination, "wb").close()
+        self.futures.append(self.submit(_fast_copy, source, destination))
+        return destination
+    
+    def raise_errors(self) -> None:
+        errors = []
+        for future in self.futures:
+            ex = future.exception()
+            if ex is not None:
+                errors.append(ex)
+        
+        if len(errors) != 0:
+            raise shutil.Error(errors)
+
+
 def copy_file_or_directory(source: Path, target: Path, executor: Optional[str] = None) -> bool:
     try:
         destination = target
@@ -99,10 +225,12 @@ def copy_file_or_directory(source: Path, target: Path, executor: Optional[str] =
             destination = target / Path(os.path.basename(source))
 
         if source.is_dir():
-            shutil.copytree(source, destination)
+            with _ParallelCopier() as copier:
+                shutil.copytree(source, destination, copy_function=copier.copy)
+            copier.raise_errors()
         else:
             os.makedirs(os.path.dirname(destination), exist_ok=True)
-            shutil.copy2(source, destination)
+            _fast_copy(source, destination)
 
         logger.trace(f"Copied {'directory' if source.is_dir() else 'file'} from {source} to {destination}")
 
@@ -117,9 +245,9 @@ def copy_file_or_directory(source: Path, target: Path, executor: Optional[str] =
 
 def rename_file_or_directory(file_or_directory: Path, new_name: str) -> bool:
     try:
-        os.rename(file_or_directory, new_name)
+        os.replace(file_or_directory, new_name)
         return True
-    except Exception as ex:
+    except OSError as ex:
         logger.opt(exception=ex).error(f"Error while renaming '{file_or_directory}' to '{new_name}'")
         return False
 
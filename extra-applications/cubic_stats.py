@@ -16,16 +16,23 @@
 # along with this program. If not, see https://www.gnu.org/licenses/.
 #
 
+import re
+import os
 import time
+import socket
+import struct
 import subprocess
 
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Iterable, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, Future
 
 from applications.base_application import *
 from common.application_configs import ApplicationSettings
+from common.instance_manager_message import LogMessageType
 
 """
-Parse 'ss -tipH' to get TCP congestion control stats for a specific list of 
+Query the kernel via netlink sock_diag (same data as 'ss -tipH', which is used
+as fallback) to get TCP congestion control stats for a specific list of 
 processes ("procs"). Supported congestion control algorithms: cubic
 Checks every "interval" seconds (optional, defaults to 1). If an iPerf connection
 is monitored, the "iperf_mode" option can be used to disable recording of the 
@@ -45,6 +52,189 @@ Example config:
     }
 """
 
+# ss output is ASCII and parsed as bytes, int() and float() accept them directly
+_UNITS = {
+    b"k": 1_000,
+    b"K": 1_000,
+    b"M": 1_000_000,
+    b"G": 1_000_000_000,
+    b"T": 1_000_000_000_000,
+    b"b": 1,
+    b"B": 8,
+    b"p": 1
+}
+
+
+def _interpret_bits(input: bytes):
+    if input.endswith(b"bps"):
+        input = input[:-3]
+
+    unit = input[-1:]
+    if unit.isdigit():
+        return int(input)
+    
+    multiplier = _UNITS.get(unit)
+    if multiplier is None:
+        raise Exception(f"Unsupported Unit: {unit.decode('ascii', errors='replace')}")
+
+    return int(float(input[:-1]) * multiplier)
+
+
+def _parse_wscale(context, value: bytes):
+    send_scale, recv_scale = value.split(b",", maxsplit=1)
+    context["send_scale"] = int(send_scale)
+    context["recv_scale"] = int(recv_scale)
+
+
+def _parse_rtt(context, value: bytes):
+    rtt, rttvar = value.split(b"/", maxsplit=1)
+    context["rtt"] = float(rtt)
+    context["rttvar"] = float(rttvar)
+
+
+def _parse_int_to(key: str):
+    def parse(context, value: bytes):
+        context[key] = int(value)
+    return parse
+
+
+def _parse_bits_to(key: str):
+    def parse(context, value: bytes):
+        context[key] = _interpret_bits(value)
+    return parse
+
+
+_FIELD_PARSERS = {
+    b"wscale": _parse_wscale,
+    b"rto": _parse_int_to("rto"),
+    b"rtt": _parse_rtt,
+    b"mss": _parse_int_to("mss"),
+    b"cwnd": _parse_int_to("cwnd"),
+    b"pmtu": _parse_int_to("pmtu"),
+    b"bytes_retrans": _parse_bits_to("bytes_retrans"),
+    b"bytes_acked": _parse_bits_to("bytes_acked"),
+    b"unacked": _parse_bits_to("unacked")
+}
+
+# Values of a connection without cubic details, copied for each socket
+_EMPTY_CONTEXT = {
+    "recv_q": 0,
+    "send_q": 0,
+    "send_scale": 0,
+    "recv_scale": 0,
+    "rto": 0,
+    "rtt": 0.0,
+    "rttvar": 0.0,
+    "mss": 0,
+    "cwnd": 0,
+    "pmtu": 0,
+    "bytes_retrans": 0,
+    "bytes_acked": 0,
+    "unacked": 0
+}
+
+# Netlink sock_diag, see linux/sock_diag.h, linux/inet_diag.h and linux/tcp.h
+_NETLINK_SOCK_DIAG = 4
+_SOCK_DIAG_BY_FAMILY = 20
+_NLM_F_REQUEST = 0x001
+_NLM_F_DUMP = 0x300
+_NLMSG_ERROR = 2
+_NLMSG_DONE = 3
+_TCPF_ESTABLISHED = 1 << 1
+_INET_DIAG_INFO = 2
+_INET_DIAG_CONG = 4
+
+_NLMSG_HEADER = struct.Struct("=IHHII")
+_INET_DIAG_REQ = struct.Struct("=BBBxI48x")
+_INET_DIAG_MSG = struct.Struct("=BBBB48xIIIII")
+_RTATTR = struct.Struct("=HH")
+# tcp_info up to tcpi_bytes_retrans: wscale, rto, snd_mss, unacked, pmtu, 
+# rtt, rttvar, snd_cwnd, bytes_acked, bytes_retrans
+_TCP_INFO = struct.Struct("=6xBxI4xI4xI16x16xI4xII4xI36xQ80xQ")
+
+
+def _sock_diag_request(family: int, sequence: int) -> bytes:
+    extensions = (1 << (_INET_DIAG_INFO - 1)) | (1 << (_INET_DIAG_CONG - 1))
+    request = _INET_DIAG_REQ.pack(family, socket.IPPROTO_TCP, extensions, _TCPF_ESTABLISHED)
+    return _NLMSG_HEADER.pack(_NLMSG_HEADER.size + len(request), _SOCK_DIAG_BY_FAMILY, 
+                              _NLM_F_REQUEST | _NLM_F_DUMP, sequence, 0) + request
+
+
+def _parse_sock_diag(message: memoryview) -> Tuple[int, Dict[str, Any]]:
+    _, _, _, _, _, recv_q, send_q, _, inode = _INET_DIAG_MSG.unpack_from(message)
+    context = _EMPTY_CONTEXT.copy()
+    context["recv_q"] = recv_q
+    context["send_q"] = send_q
+
+    info = None
+    congestion = None
+    offset = _INET_DIAG_MSG.size
+    while offset + _RTATTR.size <= len(message):
+        length, type = _RTATTR.unpack_from(message, offset)
+        if length < _RTATTR.size:
+            break
+
+        payload = message[offset + _RTATTR.size:offset + length]
+        if type == _INET_DIAG_INFO:
+            info = payload
+        elif type == _INET_DIAG_CONG:
+            congestion = bytes(payload).rstrip(b"\x00")
+        offset += (length + 3) & ~3
+
+    # Same as the ss path: Only cubic connections have details
+    if congestion != b"cubic" or info is None:
+        return inode, context
+    
+    # Older kernels report a shorter tcp_info, missing fields stay 0
+    if len(info) < _TCP_INFO.size:
+        info = bytes(info) + bytes(_TCP_INFO.size - len(info))
+    
+    wscale, rto, mss, unacked, pmtu, rtt, rttvar, cwnd, bytes_acked, bytes_retrans = _TCP_INFO.unpack_from(info)
+    context["send_scale"] = wscale & 0x0F
+    context["recv_scale"] = wscale >> 4
+    context["rto"] = rto // 1000
+    context["rtt"] = rtt / 1000
+    context["rttvar"] = rttvar / 1000
+    context["mss"] = mss
+    context["cwnd"] = cwnd
+    context["pmtu"] = pmtu
+    context["bytes_retrans"] = bytes_retrans
+    context["bytes_acked"] = bytes_acked
+    context["unacked"] = unacked
+    return inode, context
+
+
+def _get_socket_owners() -> Dict[int, Tuple[str, int]]:
+    # Like ss, the first process (and its lowest fd) owning a socket inode is used
+    owners = {}
+    for pid in sorted(int(entry) for entry in os.listdir("/proc") if entry.isdigit()):
+        try:
+            with open(f"/proc/{pid}/comm", "rb") as handle:
+                prog = handle.read().rstrip(b"\n").decode("utf-8", errors="replace")
+            fds = sorted(int(fd) for fd in os.listdir(f"/proc/{pid}/fd"))
+        except OSError:
+            continue # Process exited or is not accessible
+
+        for fd in fds:
+            try:
+                target = os.readlink(f"/proc/{pid}/fd/{fd}")
+            except OSError:
+                continue
+            
+            if target.startswith("socket:["):
+                owners.setdefault(int(target[8:-1]), (prog, fd))
+    
+    return owners
+
+
+_SS_WORKER_SCRIPT = "while read -r _; do /usr/bin/ss -tipH state established; printf '\\0%d\\n' $?; done"
+
+# Socket line: Recv-Q, Send-Q, local, remote, first process from users:(("prog",pid=X,fd=Y),...)
+_HEADER_RE = re.compile(rb'(\d+)\s+(\d+)\s+\S+\s+\S+(?:.*?\(\("([^"]*)",[^,]*,fd=(\d+)\))?')
+_CUBIC_RE = re.compile(rb'\s+cubic\b(.*)')
+_FIELD_RE = re.compile(rb'\b(' + b'|'.join(_FIELD_PARSERS) + rb'):(\S+)')
+
+
 class CubicStatsApplicationConfig(ApplicationSettings):
     def __init__(self, procs: List[str], 
                  interval: int = 1,
@@ -59,6 +249,7 @@ class CubicStatsApplication(BaseApplication):
     def set_and_validate_config(self, config: ApplicationSettings) -> Tuple[bool, Optional[str]]:
         try:
             self.settings = CubicStatsApplicationConfig(**config)
+            self.settings.procs = frozenset(self.settings.procs) # checked for each connection
 
             if "iperf3" not in self.settings.procs and self.settings.iperf_mode:
                 return False, "iperf3 mode is not possible without iperf3 process"
@@ -67,122 +258,109 @@ class CubicStatsApplication(BaseApplication):
         except Exception as ex:
             return False, f"Config validation failed: {ex}"
 
-    def __interpret_bits(self, input: str):
-        input = input.replace("bps", "")
-
-        units = {
-                "k": 1_000,
-                "K": 1_000,
-                "M": 1_000_000,
-                "G": 1_000_000_000,
-                "T": 1_000_000_000_000,
-                "b": 1,
-                "B": 8,
-                "p": 1
-            }
-        
-        if input[-1].isalpha():
-            number_part = float(input[:-1])
-            
-            if input[-1] in units:
-                return int(number_part * units[input[-1]])
-            else:
-                raise Exception(f"Unsupported Unit: {input[-1]}")
-        else:
-            return int(input)
-
-    def __parse_output(self, input: str):
+    def __parse_output(self, lines: Iterable[bytes]):
         results = []
         context = None
-        for line in input.split("\n"):
-            if line.strip() == "":
-                continue
-
-            if not line.startswith((' ', '\t')):
-                if context is not None:
-                    results.append(context)
+        for line in lines:
+            header = _HEADER_RE.match(line)
+            if header is not None:
+                recv_q, send_q, prog, fd = header.groups()
+                if prog is None: # Socket without process
                     context = None
+                    continue
 
-                recv_q, send_q, local, remote, proc_dirtry = line.split(maxsplit=4)
-                _, proc_dirtry = proc_dirtry.split("((", maxsplit=1)
-                prog_dirtry, _, fd_dirtry = proc_dirtry.split(",", maxsplit=2)
-                prog = prog_dirtry.replace("\"", "")
-                _, fd = fd_dirtry.replace("))", "").split("=", maxsplit=1)
-
-                context = {
-                    "_": {
-                        "prog": prog,
-                        "fd": int(fd)
-                    },
-                    "recv_q": int(recv_q),
-                    "send_q": int(send_q),
-                    "send_scale": 0,
-                    "recv_scale": 0,
-                    "rto": 0,
-                    "rtt": 0.0,
-                    "rttvar": 0.0,
-                    "mss": 0,
-                    "cwnd": 0,
-                    "pmtu": 0,
-                    "bytes_retrans": 0,
-                    "bytes_acked": 0,
-                    "unacked": 0
-                }
+                context = _EMPTY_CONTEXT.copy()
+                context["_"] = {"prog": prog.decode("utf-8", errors="replace"), "fd": int(fd)}
+                context["recv_q"] = int(recv_q)
+                context["send_q"] = int(send_q)
+                results.append(context)
                 continue
 
+            # Detail lines belong to the last socket line
             if context is None:
                 continue
-            
-            line = line.strip()
-            if not line.startswith("cubic"):
-                continue
 
-            segments = line.split()
-            index = 0
-            while index < len(segments):
-                segment = segments[index]
-                if segment.startswith("wscale"):
-                    _, wscale = segment.split(":", maxsplit=1)
-                    send_scale, recv_scale = wscale.split(",", maxsplit=1)
-                    context["send_scale"] = int(send_scale)
-                    context["recv_scale"] = int(recv_scale)
-                elif segment.startswith("rto"):
-                    _, rto = segment.split(":", maxsplit=1)
-                    context["rto"] = int(rto)
-                elif segment.startswith("rtt"):
-                    _, rtt = segment.split(":", maxsplit=1)
-                    rtt, rttvar = rtt.split("/", maxsplit=1)
-                    context["rtt"] = float(rtt)
-                    context["rttvar"] = float(rttvar)
-                elif segment.startswith("mss"):
-                    _, mss = segment.split(":", maxsplit=1)
-                    context["mss"] = int(mss)
-                elif segment.startswith("cwnd"):
-                    _, cwnd = segment.split(":", maxsplit=1)
-                    context["cwnd"] = int(cwnd)
-                elif segment.startswith("pmtu"):
-                    _, pmtu = segment.split(":", maxsplit=1)
-                    context["pmtu"] = int(pmtu)
-                elif segment.startswith("bytes_retrans"):
-                    _, retrans = segment.split(":", maxsplit=1)
-                    context["bytes_retrans"] = self.__interpret_bits(retrans)
-                elif segment.startswith("bytes_acked"):
-                    _, acked = segment.split(":", maxsplit=1)
-                    context["bytes_acked"] = self.__interpret_bits(acked)
-                elif segment.startswith("unacked"):
-                    _, unacked = segment.split(":", maxsplit=1)
-                    context["unacked"] = self.__interpret_bits(unacked)
-            
-                index += 1
+            cubic = _CUBIC_RE.match(line)
+            if cubic is not None:
+                for field in _FIELD_RE.finditer(cubic.group(1)):
+                    _FIELD_PARSERS[field.group(1)](context, field.group(2))
+
+        return results
+    
+    def __query_sock_diag(self, diag: socket.socket) -> List[Dict[str, Any]]:
+        sockets: List[Tuple[int, Dict[str, Any]]] = []
+        for family in (socket.AF_INET, socket.AF_INET6):
+            self.__sequence += 1
+            diag.send(_sock_diag_request(family, self.__sequence))
+
+            done = False
+            while not done:
+                data = memoryview(diag.recv(65536))
+                offset = 0
+                while offset + _NLMSG_HEADER.size <= len(data):
+                    length, type, _, _, _ = _NLMSG_HEADER.unpack_from(data, offset)
+                    if length < _NLMSG_HEADER.size:
+                        break
+
+                    if type == _NLMSG_DONE:
+                        done = True
+                        break
+                    elif type == _NLMSG_ERROR:
+                        error = -struct.unpack_from("=i", data, offset + _NLMSG_HEADER.size)[0]
+                        raise OSError(error, f"sock_diag request failed: {os.strerror(error)}")
+                    elif type == _SOCK_DIAG_BY_FAMILY:
+                        sockets.append(_parse_sock_diag(data[offset + _NLMSG_HEADER.size:offset + length]))
+
+                    offset += (length + 3) & ~3
         
-        if context is not None:
-            results.append(context)
+        # Owners are only looked up again when unknown sockets show up
+        if any(inode not in self.__owners for inode, _ in sockets):
+            owners = _get_socket_owners()
+            self.__owners = {inode: owners.get(inode) for inode, _ in sockets}
+
+        results = []
+        for inode, context in sockets:
+            owner = self.__owners.get(inode)
+            if owner is None: # Socket without process
+                continue
 
+            context["_"] = {"prog": owner[0], "fd": owner[1]}
+            results.append(context)
+        
         return results
     
-    def __get_one_datapoint(self, input_str: str):
-        contexts = self.__parse_output(input_str)
+    def __start_ss_worker(self) -> subprocess.Popen:
+        # One shell for the whole run, every newline on stdin triggers a dump
+        # that is terminated by a NUL line with the exit code of ss
+        return subprocess.Popen(["/bin/sh", "-c", _SS_WORKER_SCRIPT], 
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, 
+                                shell=False)
 
+    def __query_ss(self, worker: subprocess.Popen) -> List[Dict[str, Any]]:
+        worker.stdin.write(b"\n")
+        worker.stdin.flush()
+
+        returncode: List[int] = []
+        def read_dump():
+            while True:
+                line = worker.stdout.readline()
+                if line == b"":
+                    raise Exception("'ss' worker exited unexpectedly")
+                
+                if line.startswith(b"\x00"):
+                    returncode.append(int(line[1:]))
+                    return
+                
+                yield line
+        
+        # Parse while ss is still writing, the full dump is never buffered
+        contexts = self.__parse_output(read_dump())
+        if returncode[0] != 0:
+            raise Exception(f"Unable to run 'ss' command, exited with {returncode[0]}")
+        
+        return contexts
+
+    def __get_one_datapoint(self, contexts: List[Dict[str, Any]]):
         if len(contexts) == 0:
             return
 
@@ -191,6 +369,7 @@ class CubicStatsApplication(BaseApplication):
         else:
             control_fd = -1
 
+        rows = []
         for context in contexts:
             prog = context["_"]["prog"]
             fd = context["_"]["fd"]
@@ -202,20 +381,64 @@ class CubicStatsApplication(BaseApplication):
             if prog not in self.settings.procs:
                 continue
             
-            self.interface.data_point("cubic-stats", context, {
+            rows.append((context, {
                 "prog": prog,
                 "fd": str(fd)
-            })
+            }))
+        
+        if len(rows) != 0:
+            self.interface.data_points("cubic-stats", rows)
 
     def start(self, runtime: Optional[int]) -> bool:
-        end_at = time.time() + runtime
-        while runtime is None or end_at > time.time():
-            proc = subprocess.run(["/usr/bin/ss", "-tipH", "state", "established"], capture_output=True, shell=False)
-            if proc.returncode != 0:
-                raise Exception(f"Unable to run 'ss' command: {proc.stderr.decode('utf-8')}")
+        next_tick = time.monotonic()
+        end_at = None if runtime is None else next_tick + runtime
+
+        # Query the kernel directly, ss is only used when sock_diag is not usable
+        diag: Optional[socket.socket] = None
+        worker: Optional[subprocess.Popen] = None
+        self.__sequence = 0
+        self.__owners: Dict[int, Optional[Tuple[str, int]]] = {}
+        try:
+            diag = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_SOCK_DIAG)
+        except OSError as ex:
+            self.interface.push_log_message(f"sock_diag not available, using ss: {ex}", 
+                                            LogMessageType.MSG_WARNING)
+            worker = self.__start_ss_worker()
+
+        try:
+            # Data points of one sample are sent while the next one is collected,
+            # only the emitter thread uses the interface during the loop
+            with ThreadPoolExecutor(max_workers=1) as emitter:
+                pending: Optional[Future] = None
+                while end_at is None or end_at > time.monotonic():
+                    if diag is not None:
+                        contexts = self.__query_sock_diag(diag)
+                    else:
+                        contexts = self.__query_ss(worker)
+                    
+                    if pending is not None:
+                        pending.result()
+                    pending = emitter.submit(self.__get_one_datapoint, contexts)
+
+                    # Keep a fixed sampling grid, time spent in ss and parsing is not added
+                    next_tick += self.settings.interval
+                    sleep_for = next_tick - time.monotonic()
+                    if sleep_for > 0:
+                        time.sleep(sleep_for)
+                    else:
+                        next_tick = time.monotonic() # Fell behind, skip missed samples
+                
+                if pending is not None:
+                    pending.result()
+        finally:
+            if diag is not None:
+                diag.close()
             
-            self.__get_one_datapoint(proc.stdout.decode('utf-8'))
-            time.sleep(self.settings.interval)
+            if worker is not None:
+                # EOF on stdin ends the worker loop
+                worker.stdin.close()
+                worker.wait()
+                worker.stdout.close()
         
         return True
     
@@ -16,16 +16,22 @@
 # along with this program. If not, see https://www.gnu.org/licenses/.
 #
 
+import re
+import os
 import time
+import socket
+import struct
 import subprocess
 
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Dict, Any
 
 from applications.base_application import *
 from common.application_configs import ApplicationSettings
+from common.instance_manager_message import LogMessageType
 
 """
-Parse 'tc -s qdisc sh' for a given list of interfaces. Supported qdiscs: netem, tbf
+Query qdisc stats via netlink (same data as 'tc -s qdisc sh', which is used as 
+fallback) for a given list of interfaces. Supported qdiscs: netem, tbf
 Two list are provided: "netem_if" for the interfaces that should be monitored for
 netem stats and "tbf_if" that should be monitored for tbf statistics. Stats will
 be queried every "interval" seconds (defaults to one).
@@ -47,6 +53,129 @@ Example config:
     }
 """
 
+# rtnetlink, see linux/rtnetlink.h, linux/pkt_sched.h and linux/gen_stats.h
+_NETLINK_ROUTE = 0
+_RTM_NEWQDISC = 36
+_RTM_GETQDISC = 38
+_NLM_F_REQUEST = 0x001
+_NLM_F_DUMP = 0x300
+_NLMSG_ERROR = 2
+_NLMSG_DONE = 3
+_TCA_KIND = 1
+_TCA_STATS2 = 7
+_TCA_STATS_BASIC = 1
+_TCA_STATS_QUEUE = 3
+
+_NLMSG_HEADER = struct.Struct("=IHHII")
+_TCMSG = struct.Struct("=B3xiIII")
+_RTATTR = struct.Struct("=HH")
+_GNET_STATS_BASIC = struct.Struct("=QI") # bytes, packets
+_GNET_STATS_QUEUE = struct.Struct("=IIIII") # qlen, backlog, drops, requeues, overlimits
+
+_MONITORED_QDISCS = (b"netem", b"tbf")
+
+# 'qdisc <kind> <handle>: dev <dev> ...' followed by the stat lines indented by one space,
+# other qdiscs are skipped by the regex itself
+_QDISC_BLOCK_RE = re.compile(rb'^qdisc (' + b"|".join(_MONITORED_QDISCS) + rb') ([0-9a-f]+): dev (\S+)[^\n]*\n'
+                             rb'((?: [^\n]*(?:\n|$))+)', re.M)
+
+# Name, type and description of each series, all are selected by dev and qdisc
+_EXPORTED_SERIES = (
+    ("sent_bytes", ExportResultDataType.DATA_SIZE, "Bytes sent via Qdisc"),
+    ("sent_packets", ExportResultDataType.COUNT, "Packets sent via Qdisc"),
+    ("dropped", ExportResultDataType.COUNT, "Dropped Packets"),
+    ("overlimits", ExportResultDataType.COUNT, "Packets delayed due to overlimit"),
+    ("sent_requeues", ExportResultDataType.DATA_SIZE, "Packets requeued before sending"),
+    ("backlog_bytes", ExportResultDataType.DATA_SIZE, "Bytes held by Qdisc and children"),
+    ("backlog_packets", ExportResultDataType.COUNT, "Packets held by Qdisc and children"),
+    ("backlog_requeues", ExportResultDataType.COUNT, "Packets requeued to backlog"),
+)
+
+_TC_WORKER_SCRIPT = "while read -r _; do /usr/sbin/tc -s qdisc sh 2>&1; printf '\\0%d\\n' $?; done"
+
+# Sent %i bytes %i pkt (dropped %i, overlimits %i requeues %i) backlog %s %ip requeues %i
+# Only the backlog size is printed with a unit by tc, e.g. '69552b' or '1200Kb'
+_STAT_RE = re.compile(rb'Sent (\d+) bytes (\d+) pkt \(dropped (\d+), overlimits (\d+) requeues (\d+)\)\s+'
+                      rb'backlog (\S+?)b (\d+)p requeues (\d+)')
+
+
+# tc output is ASCII and parsed as bytes, int() and float() accept them directly
+_UNITS = {
+    b"k": 1_000,
+    b"K": 1_000,
+    b"M": 1_000_000,
+    b"G": 1_000_000_000,
+    b"T": 1_000_000_000_000,
+    b"b": 1,
+    b"B": 8,
+    b"p": 1
+}
+
+
+def _interpret_number(input: bytes):
+    unit = input[-1:]
+    if unit.isdigit():
+        return int(input)
+    
+    multiplier = _UNITS.get(unit)
+    if multiplier is None:
+        raise Exception(f"Unsupported Unit: {unit.decode('ascii', errors='replace')}")
+
+    return int(float(input[:-1]) * multiplier)
+
+
+def _iterate_attributes(data: memoryview):
+    offset = 0
+    while offset + _RTATTR.size <= len(data):
+        length, type = _RTATTR.unpack_from(data, offset)
+        if length < _RTATTR.size:
+            break
+
+        yield type, data[offset + _RTATTR.size:offset + length]
+        offset += (length + 3) & ~3
+
+
+def _parse_qdisc(message: memoryview) -> Optional[Dict[str, Any]]:
+    _, ifindex, handle, _, _ = _TCMSG.unpack_from(message)
+
+    kind = None
+    stats2 = None
+    for type, payload in _iterate_attributes(message[_TCMSG.size:]):
+        if type == _TCA_KIND:
+            kind = bytes(payload).rstrip(b"\x00")
+        elif type == _TCA_STATS2:
+            stats2 = payload
+    
+    if kind not in _MONITORED_QDISCS or stats2 is None:
+        return None
+
+    # Same fields that are shown by 'tc -s qdisc sh', which always prints all of them
+    stats = dict.fromkeys((name for name, _, _ in _EXPORTED_SERIES), 0)
+    for type, payload in _iterate_attributes(stats2):
+        if type == _TCA_STATS_BASIC:
+            stats["sent_bytes"], stats["sent_packets"] = _GNET_STATS_BASIC.unpack_from(payload)
+        elif type == _TCA_STATS_QUEUE:
+            qlen, backlog, drops, requeues, overlimits = _GNET_STATS_QUEUE.unpack_from(payload)
+            stats["dropped"] = drops
+            stats["overlimits"] = overlimits
+            stats["sent_requeues"] = requeues
+            stats["backlog_bytes"] = backlog
+            stats["backlog_packets"] = qlen
+            stats["backlog_requeues"] = requeues
+
+    try:
+        dev = socket.if_indextoname(ifindex)
+    except OSError:
+        return None # Interface was removed meanwhile
+
+    return {
+        "qdisc": kind.decode("ascii"),
+        "handle": f"{handle >> 16:x}", # Major, as printed by tc
+        "dev": dev,
+        "stats": stats
+    }
+
+
 class QdiscStatsApplicationConfig(ApplicationSettings):
     def __init__(self, interval: int = 1, 
                  netem_if: Optional[List[str]] = None, 
@@ -61,194 +190,176 @@ class QdiscStatsApplication(BaseApplication):
     def set_and_validate_config(self, config: ApplicationSettings) -> Tuple[bool, Optional[str]]:
         try:
             self.settings = QdiscStatsApplicationConfig(**config)
-            count = 0
-            if self.settings.netem_if is not None:
-                count += len(self.settings.netem_if)
-            if self.settings.tbf_if is not None:
-                count += len(self.settings.tbf_if)
 
-            if count == 0:
+            # Checked for every qdisc in each sample, null disables a qdisc type
+            self.settings.netem_if = frozenset(self.settings.netem_if or ())
+            self.settings.tbf_if = frozenset(self.settings.tbf_if or ())
+
+            if len(self.settings.netem_if) + len(self.settings.tbf_if) == 0:
                 return False, "No interfaces for tc qdisc monitoring configured."
             else:
                 return True, None
         except Exception as ex:
             return False, f"Config validation failed: {ex}"
         
-    def __interpret_number(self, input_str: str):
-        units = {
-            "k": 1_000,
-            "K": 1_000,
-            "M": 1_000_000,
-            "G": 1_000_000_000,
-            "T": 1_000_000_000_000,
-            "b": 1,
-            "B": 8,
-            "p": 1
+    def __parse_single_stat(self, input: bytes):
+        stat = _STAT_RE.search(input)
+        if stat is None:
+            raise Exception(f"Unable to parse qdisc stats: {input.decode('utf-8', errors='replace')}")
+
+        sent_bytes, sent_packets, dropped, overlimits, sent_requeues, \
+            backlog_bytes, backlog_packets, backlog_requeues = stat.groups()
+        return {
+            "sent_bytes": int(sent_bytes),
+            "sent_packets": int(sent_packets),
+            "dropped": int(dropped),
+            "overlimits": int(overlimits),
+            "sent_requeues": int(sent_requeues),
+            "backlog_bytes": _interpret_number(backlog_bytes),
+            "backlog_packets": int(backlog_packets),
+            "backlog_requeues": int(backlog_requeues)
         }
+    
+    def __query_netlink(self, rtnl: socket.socket) -> List[Dict[str, Any]]:
+        self.__sequence += 1
+        request = _TCMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+        rtnl.send(_NLMSG_HEADER.pack(_NLMSG_HEADER.size + len(request), _RTM_GETQDISC, 
+                                     _NLM_F_REQUEST | _NLM_F_DUMP, self.__sequence, 0) + request)
+
+        results = []
+        while True:
+            data = memoryview(rtnl.recv(65536))
+            offset = 0
+            while offset + _NLMSG_HEADER.size <= len(data):
+                length, type, _, _, _ = _NLMSG_HEADER.unpack_from(data, offset)
+                if length < _NLMSG_HEADER.size:
+                    break
 
-        if input_str[-1].isalpha():
-            number_part = float(input_str[:-1])
+                if type == _NLMSG_DONE:
+                    return results
+                elif type == _NLMSG_ERROR:
+                    error = -struct.unpack_from("=i", data, offset + _NLMSG_HEADER.size)[0]
+                    raise OSError(error, f"RTM_GETQDISC request failed: {os.strerror(error)}")
+                elif type == _RTM_NEWQDISC:
+                    context = _parse_qdisc(data[offset + _NLMSG_HEADER.size:offset + length])
+                    if context is not None:
+                        results.append(context)
+                
+                offset += (length + 3) & ~3
 
-            if input_str[-1] in units:
-                return int(number_part * units[input_str[-1]])
-            else:
-                raise Exception(f"Unsupported Unit: {input_str[-1]}")
-        else:
-            return int(input_str)
+    def __start_tc_worker(self) -> subprocess.Popen:
+        # One shell for the whole run, every newline on stdin triggers a dump
+        # that is terminated by a NUL line with the exit code of tc
+        return subprocess.Popen(["/bin/sh", "-c", _TC_WORKER_SCRIPT], 
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, 
+                                shell=False)
+
+    def __query_tc(self, worker: subprocess.Popen) -> List[Dict[str, Any]]:
+        worker.stdin.write(b"\n")
+        worker.stdin.flush()
+
+        lines = []
+        while True:
+            line = worker.stdout.readline()
+            if line == b"":
+                raise Exception("'tc' worker exited unexpectedly")
+            
+            if line.startswith(b"\x00"):
+                returncode = int(line[1:])
+                break
+
+            lines.append(line)
         
-    def __parse_single_stat(self, input_str: str):
-        result = {}
-
-        # Sent %i bytes %s pkt
-        _, sent_bytes, _, sent_packets, _, remain = input_str.split(" ", maxsplit=5)
-        result["sent_bytes"] = self.__interpret_number(sent_bytes)
-        result["sent_packets"] = self.__interpret_number(sent_packets)
-
-        # (dropped %i, overlimits %i requeues %i)
-        _, dropped_dirty, _, overlimits, _, requeues_dirty, remain = remain.split(" ", maxsplit=6)
-        result["dropped"] = self.__interpret_number(dropped_dirty.replace(",", ""))
-        result["overlimits"] = self.__interpret_number(overlimits)
-        result["sent_requeues"] = self.__interpret_number(requeues_dirty.replace(")", ""))
-
-        # backlog %ib %ip requeues %i <remainder>
-        parts = remain.split(" ", maxsplit=5)
-        if len(parts) == 5:
-            _, backlog_b_dirty, backlog_p_dirty, _, requeues = parts
-        else:
-            _, backlog_b_dirty, backlog_p_dirty, _, requeues, _ = parts
-        result["backlog_bytes"] = self.__interpret_number(backlog_b_dirty[:-1])
-        result["backlog_packets"] = self.__interpret_number(backlog_p_dirty[:-1])
-        result["backlog_requeues"] = self.__interpret_number(requeues)
-
-        return result
-    
-    def __get_one_datapoint(self, input_str: str):
+        output = b"".join(lines)
+        if returncode != 0:
+            raise Exception(f"Unable to run 'tc' command: {output.decode('utf-8', errors='replace')}")
+
         results = []
-        context = None
-        for line in input_str.split("\n"):
-            if line.startswith("qdisc"):
-                if context is not None:
-                    results.append(context)
-                    context = None
-
-                _, qdisc, remain = line.split(" ", maxsplit=2)
-                if qdisc not in ["netem", "tbf"]:
-                    continue
-                else:
-                    handle, remain = remain.split(":", maxsplit=1)
-                    remain = remain.strip()
-                    _, dev, _ = remain.split(" ", maxsplit=2)
-                    context = {
-                        "qdisc": qdisc,
-                        "handle": int(handle),
-                        "dev": dev,
-                        "stats": []
-                    }
-            else:
-                if line.startswith("  "):
-                    continue
-                if context is not None:
-                    context["stats"].append(line.strip())
+        for block in _QDISC_BLOCK_RE.finditer(output):
+            qdisc, handle, dev, stats = block.groups()
+            results.append({
+                "qdisc": qdisc.decode("ascii"),
+                "handle": handle.decode("ascii"),
+                "dev": dev.decode("utf-8"),
+                "stats": self.__parse_single_stat(stats)
+            })
+        
+        return results
+    
+    def __get_one_datapoint(self, results: List[Dict[str, Any]]):
+        monitored = {"netem": self.settings.netem_if, "tbf": self.settings.tbf_if}
+        seen = set()
 
+        rows = []
         for result in results:
-            if result["qdisc"] == "netem":
-                if self.settings.netem_if is None:
-                    continue
-                if result["dev"] not in self.settings.netem_if:
-                    continue
-            elif result["qdisc"] == "tbf":
-                if self.settings.tbf_if is None:
-                    continue
-                if result["dev"] not in self.settings.tbf_if:
-                    continue
-            else:
+            if result["dev"] not in monitored.get(result["qdisc"], ()):
                 continue
-
-            stats_string = " ".join(result["stats"])
-            stats = self.__parse_single_stat(stats_string)
             
-            self.interface.data_point("qdisc-stats", stats, {
+            seen.add((result["qdisc"], result["dev"]))
+            rows.append((result["stats"], {
                 "dev": result["dev"],
                 "qdisc": result["qdisc"],
                 "handle": str(result["handle"])
-            })
+            }))
         
-        for dev in self.settings.netem_if:
-            if not len(list(filter(lambda x: x["qdisc"] == "netem" and x["dev"] == dev, results))):
-                raise Exception(f"Interface '{dev}' not found for qdisc netem.")
+        # All qdiscs of one sample are sent in a single message
+        if len(rows) != 0:
+            self.interface.data_points("qdisc-stats", rows)
         
-        for dev in self.settings.tbf_if:
-            if not len(list(filter(lambda x: x["qdisc"] == "tbf" and x["dev"] == dev, results))):
-                raise Exception(f"Interface '{dev}' not found for qdisc tbf.")
+        for qdisc, devs in monitored.items():
+            missing = devs - {dev for seen_qdisc, dev in seen if seen_qdisc == qdisc}
+            if len(missing) != 0:
+                raise Exception(f"Interfaces {', '.join(sorted(missing))} not found for qdisc {qdisc}.")
 
     def start(self, runtime: Optional[int]) -> bool:
-        end_at = time.time() + runtime
-        while runtime is None or end_at > time.time():
-            proc = subprocess.run(["/usr/sbin/tc", "-s", "qdisc", "sh"], capture_output=True, shell=False)
-            if proc.returncode != 0:
-                raise Exception(f"Unable to run 'tc' command: {proc.stderr.decode('utf-8')}")
+        next_tick = time.monotonic()
+        end_at = None if runtime is None else next_tick + runtime
+
+        # Dump qdiscs directly from the kernel, tc is only used when that is not possible
+        rtnl: Optional[socket.socket] = None
+        worker: Optional[subprocess.Popen] = None
+        self.__sequence = 0
+        try:
+            rtnl = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_ROUTE)
+        except OSError as ex:
+            self.interface.push_log_message(f"rtnetlink not available, using tc: {ex}", 
+                                            LogMessageType.MSG_WARNING)
+            worker = self.__start_tc_worker()
+
+        try:
+            while end_at is None or end_at > time.monotonic():
+                if rtnl is not None:
+                    results = self.__query_netlink(rtnl)
+                else:
+                    results = self.__query_tc(worker)
+                
+                self.__get_one_datapoint(results)
+
+                # Keep a fixed sampling grid, time spent in tc and parsing is not added
+                next_tick += self.settings.interval
+                sleep_for = next_tick - time.monotonic()
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
+                else:
+                    next_tick = time.monotonic() # Fell behind, skip missed samples
+        finally:
+            if rtnl is not None:
+                rtnl.close()
             
-            self.__get_one_datapoint(proc.stdout.decode('utf-8'))
-            time.sleep(self.settings.interval)
+            if worker is not None:
+                # EOF on stdin ends the worker loop
+                worker.stdin.close()
+                worker.wait()
+                worker.stdout.close()
         
         return True
 
-    def get_export_mapping(self, subtype: ExportSubtype) -> Optional[List[ExportResultMapping]]:        
-        return [
-            ExportResultMapping(
-                name="sent_bytes",
-                type=ExportResultDataType.DATA_SIZE,
-                description="Bytes sent via Qdisc",
-                additional_selectors={"dev": subtype.options["dev"], "qdisc": subtype.options["qdisc"]},
-                title_suffix=f'Interface: {subtype.options["dev"]}, Qdisc: {subtype.options["qdisc"]}'
-            ),
-            ExportResultMapping(
-                name="sent_packets",
-                type=ExportResultDataType.COUNT,
-                description="Packets sent via Qdisc",
-                additional_selectors={"dev": subtype.options["dev"], "qdisc": subtype.options["qdisc"]},
-                title_suffix=f'Interface: {subtype.options["dev"]}, Qdisc: {subtype.options["qdisc"]}'
-            ),
-            ExportResultMapping(
-                name="dropped",
-                type=ExportResultDataType.COUNT,
-                description="Dropped Packets",
-                additional_selectors={"dev": subtype.options["dev"], "qdisc": subtype.options["qdisc"]},
-                title_suffix=f'Interface: {subtype.options["dev"]}, Qdisc: {subtype.options["qdisc"]}'
-            ),
-            ExportResultMapping(
-                name="overlimits",
-                type=ExportResultDataType.COUNT,
-                description="Packets delayed due to overlimit",
-                additional_selectors={"dev": subtype.options["dev"], "qdisc": subtype.options["qdisc"]},
-                title_suffix=f'Interface: {subtype.options["dev"]}, Qdisc: {subtype.options["qdisc"]}'
-            ),
-            ExportResultMapping(
-                name="sent_requeues",
-                type=ExportResultDataType.DATA_SIZE,
-                description="Packets requeued before sending",
-                additional_selectors={"dev": subtype.options["dev"], "qdisc": subtype.options["qdisc"]},
-                title_suffix=f'Interface: {subtype.options["dev"]}, Qdisc: {subtype.options["qdisc"]}'
-            ),
-            ExportResultMapping(
-                name="backlog_bytes",
-                type=ExportResultDataType.DATA_SIZE,
-                description="Bytes held by Qdisc and children",
-                additional_selectors={"dev": subtype.options["dev"], "qdisc": subtype.options["qdisc"]},
-                title_suffix=f'Interface: {subtype.options["dev"]}, Qdisc: {subtype.options["qdisc"]}'
-            ),
-            ExportResultMapping(
-                name="backlog_packets",
-                type=ExportResultDataType.COUNT,
-                description="Packets held by Qdisc and children",
-                additional_selectors={"dev": subtype.options["dev"], "qdisc": subtype.options["qdisc"]},
-                title_suffix=f'Interface: {subtype.options["dev"]}, Qdisc: {subtype.options["qdisc"]}'
-            ),
-            ExportResultMapping(
-                name="backlog_requeues",
-                type=ExportResultDataType.COUNT,
-                description="Packets requeued to backlog",
-                additional_selectors={"dev": subtype.options["dev"], "qdisc": subtype.options["qdisc"]},
-                title_suffix=f'Interface: {subtype.options["dev"]}, Qdisc: {subtype.options["qdisc"]}'
-            ),
-        ]
+    def get_export_mapping(self, subtype: ExportSubtype) -> Optional[List[ExportResultMapping]]:
+        dev = subtype.options["dev"]
+        qdisc = subtype.options["qdisc"]
+        selectors = {"dev": dev, "qdisc": qdisc} # only read by the export
+        suffix = f"Interface: {dev}, Qdisc: {qdisc}"
+
+        return [ExportResultMapping(name=name, type=type, description=description,
+                                    additional_selectors=selectors, title_suffix=suffix)
+                for name, type, description in _EXPORTED_SERIES]
@@ -0,0 +1,118 @@
+#
+# This file is part of Proto²Testbed.
+#
+# Copyright (C) 2025 Martin Ottens
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+#
+
+import sys
+import socket
+import struct
+import unittest
+
+from pathlib import Path
+
+# Same import paths as on the Instance (applications and common are linked there)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "instance-manager" / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cubic_stats
+
+
+def _rtattr(type: int, payload: bytes) -> bytes:
+    attribute = struct.pack("=HH", 4 + len(payload), type) + payload
+    return attribute + bytes(-len(attribute) % 4)
+
+
+def _inet_diag_msg(recv_q: int, send_q: int, inode: int) -> bytes:
+    # family, state, timer, retrans, inet_diag_sockid (48 bytes), expires, rqueue, wqueue, uid, inode
+    # inet_diag_sockid: sport, dport, src[4], dst[4], if, cookie[2]
+    sockid = struct.pack(">HH", 5201, 43210) + bytes(32) + struct.pack("=I", 0) + bytes(8)
+    return struct.pack("=BBBB", socket.AF_INET, 1, 0, 0) + sockid + \
+        struct.pack("=IIIII", 0, recv_q, send_q, 1000, inode)
+
+
+def _tcp_info(length: int = 232) -> bytes:
+    # Fields at their offsets in struct tcp_info (linux/tcp.h)
+    info = bytearray(length)
+    info[6] = (7 << 4) | 9 # tcpi_snd_wscale:4, tcpi_rcv_wscale:4
+    struct.pack_into("=I", info, 8, 204000) # tcpi_rto (us)
+    struct.pack_into("=I", info, 16, 1448) # tcpi_snd_mss
+    struct.pack_into("=I", info, 24, 17) # tcpi_unacked
+    struct.pack_into("=I", info, 60, 1500) # tcpi_pmtu
+    struct.pack_into("=I", info, 68, 12345) # tcpi_rtt (us)
+    struct.pack_into("=I", info, 72, 678) # tcpi_rttvar (us)
+    struct.pack_into("=I", info, 80, 42) # tcpi_snd_cwnd
+    if length >= 128:
+        struct.pack_into("=Q", info, 120, 987654321) # tcpi_bytes_acked
+    if length >= 216:
+        struct.pack_into("=Q", info, 208, 31337) # tcpi_bytes_retrans
+    return bytes(info)
+
+
+class ParseSockDiagTest(unittest.TestCase):
+    def test_cubic_connection(self):
+        message = _inet_diag_msg(3, 5, 424242) + _rtattr(2, _tcp_info()) + _rtattr(4, b"cubic\x00")
+        inode, context = cubic_stats._parse_sock_diag(memoryview(message))
+
+        self.assertEqual(inode, 424242)
+        self.assertEqual(context, {
+            "recv_q": 3,
+            "send_q": 5,
+            "send_scale": 9,
+            "recv_scale": 7,
+            "rto": 204,
+            "rtt": 12.345,
+            "rttvar": 0.678,
+            "mss": 1448,
+            "cwnd": 42,
+            "pmtu": 1500,
+            "bytes_retrans": 31337,
+            "bytes_acked": 987654321,
+            "unacked": 17
+        })
+
+    def test_short_tcp_info(self):
+        # Kernels before tcpi_bytes_retrans was added report less data
+        message = _inet_diag_msg(0, 0, 1) + _rtattr(4, b"cubic\x00") + _rtattr(2, _tcp_info(192))
+        _, context = cubic_stats._parse_sock_diag(memoryview(message))
+
+        self.assertEqual(context["cwnd"], 42)
+        self.assertEqual(context["bytes_acked"], 987654321)
+        self.assertEqual(context["bytes_retrans"], 0)
+
+    def test_other_congestion_control(self):
+        message = _inet_diag_msg(1, 2, 7) + _rtattr(2, _tcp_info()) + _rtattr(4, b"bbr\x00")
+        inode, context = cubic_stats._parse_sock_diag(memoryview(message))
+
+        self.assertEqual(inode, 7)
+        self.assertEqual(context, {**cubic_stats._EMPTY_CONTEXT, "recv_q": 1, "send_q": 2})
+
+
+class SockDiagRequestTest(unittest.TestCase):
+    def test_request_layout(self):
+        request = cubic_stats._sock_diag_request(socket.AF_INET6, 9)
+        length, type, flags, sequence, _ = struct.unpack_from("=IHHII", request)
+        self.assertEqual((length, type, flags, sequence), (len(request), 20, 0x301, 9))
+
+        # struct inet_diag_req_v2: family, protocol, ext, pad, states, inet_diag_sockid
+        family, protocol, ext, states = struct.unpack_from("=BBBxI", request, 16)
+        self.assertEqual((family, protocol), (socket.AF_INET6, socket.IPPROTO_TCP))
+        self.assertEqual(ext, (1 << 1) | (1 << 3)) # INET_DIAG_INFO, INET_DIAG_CONG
+        self.assertEqual(states, 1 << 1) # TCP_ESTABLISHED
+        self.assertEqual(len(request), 16 + 56)
+
+
+if __name__ == "__main__":
+    unittest.main()
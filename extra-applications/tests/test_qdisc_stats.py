@@ -0,0 +1,139 @@
+#
+# This file is part of Proto²Testbed.
+#
+# Copyright (C) 2025 Martin Ottens
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+#
+
+import sys
+import socket
+import struct
+import unittest
+
+from pathlib import Path
+
+# Same import paths as on the Instance (applications and common are linked there)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "instance-manager" / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import qdisc_stats
+
+
+def _rtattr(type: int, payload: bytes) -> bytes:
+    attribute = struct.pack("=HH", 4 + len(payload), type) + payload
+    return attribute + bytes(-len(attribute) % 4)
+
+
+def _qdisc_message(kind: bytes, ifindex: int, handle: int, stats2: bytes) -> bytes:
+    # struct tcmsg: family, 3 pad bytes, ifindex, handle, parent, info
+    tcmsg = struct.pack("=B3xiIII", socket.AF_UNSPEC, ifindex, handle, 0xFFFFFFFF, 1)
+    return tcmsg + _rtattr(1, kind + b"\x00") + _rtattr(7, stats2) # TCA_KIND, TCA_STATS2
+
+
+# struct gnet_stats_basic is padded to 16 bytes by the kernel
+_BASIC = _rtattr(1, struct.pack("=QI4x", 123456789, 4321)) # TCA_STATS_BASIC
+# struct gnet_stats_queue: qlen, backlog, drops, requeues, overlimits
+_QUEUE = _rtattr(3, struct.pack("=IIIII", 7, 10500, 12, 3, 42)) # TCA_STATS_QUEUE
+
+
+class ParseQdiscTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ifindex = socket.if_nametoindex("lo")
+
+    def test_netem_stats(self):
+        message = _qdisc_message(b"netem", self.ifindex, 0x80010000, _BASIC + _QUEUE)
+        result = qdisc_stats._parse_qdisc(memoryview(message))
+
+        self.assertEqual(result["qdisc"], "netem")
+        self.assertEqual(result["handle"], "8001")
+        self.assertEqual(result["dev"], "lo")
+        self.assertEqual(result["stats"], {
+            "sent_bytes": 123456789,
+            "sent_packets": 4321,
+            "dropped": 12,
+            "overlimits": 42,
+            "sent_requeues": 3,
+            "backlog_bytes": 10500,
+            "backlog_packets": 7,
+            "backlog_requeues": 3
+        })
+
+    def test_missing_stats_default_to_zero(self):
+        message = _qdisc_message(b"tbf", self.ifindex, 0x10000, _QUEUE)
+        result = qdisc_stats._parse_qdisc(memoryview(message))
+        self.assertEqual(result["stats"]["sent_bytes"], 0)
+        self.assertEqual(result["stats"]["sent_packets"], 0)
+        self.assertEqual(result["stats"]["dropped"], 12)
+
+        message = _qdisc_message(b"tbf", self.ifindex, 0x10000, _BASIC)
+        result = qdisc_stats._parse_qdisc(memoryview(message))
+        self.assertEqual(result["stats"]["sent_bytes"], 123456789)
+        self.assertEqual(result["stats"]["backlog_bytes"], 0)
+        self.assertEqual(result["stats"]["backlog_packets"], 0)
+
+        # Both paths export the same series
+        self.assertEqual(set(result["stats"].keys()),
+                         {name for name, _, _ in qdisc_stats._EXPORTED_SERIES})
+
+    def test_other_qdiscs_are_skipped(self):
+        message = _qdisc_message(b"fq_codel", self.ifindex, 0, _BASIC + _QUEUE)
+        self.assertIsNone(qdisc_stats._parse_qdisc(memoryview(message)))
+
+
+class _FakeNetlinkSocket:
+    def __init__(self, replies) -> None:
+        self.replies = list(replies)
+        self.sent = []
+
+    def send(self, data: bytes) -> int:
+        self.sent.append(data)
+        return len(data)
+
+    def recv(self, size: int) -> bytes:
+        return self.replies.pop(0)
+
+
+def _nlmsg(type: int, payload: bytes, sequence: int = 1) -> bytes:
+    message = struct.pack("=IHHII", 16 + len(payload), type, 2, sequence, 0) + payload
+    return message + bytes(-len(message) % 4)
+
+
+class QueryNetlinkTest(unittest.TestCase):
+    def test_multipart_dump(self):
+        ifindex = socket.if_nametoindex("lo")
+        netem = _qdisc_message(b"netem", ifindex, 0x80010000, _BASIC + _QUEUE)
+        noqueue = _qdisc_message(b"noqueue", ifindex, 0, _BASIC)
+        rtnl = _FakeNetlinkSocket([
+            _nlmsg(36, netem) + _nlmsg(36, noqueue), # RTM_NEWQDISC
+            _nlmsg(3, struct.pack("=i", 0)) # NLMSG_DONE
+        ])
+
+        app = qdisc_stats.QdiscStatsApplication()
+        app._QdiscStatsApplication__sequence = 0
+        results = app._QdiscStatsApplication__query_netlink(rtnl)
+
+        self.assertEqual([(result["qdisc"], result["dev"]) for result in results], [("netem", "lo")])
+        length, type, flags, _, _ = struct.unpack_from("=IHHII", rtnl.sent[0])
+        self.assertEqual((length, type, flags), (len(rtnl.sent[0]), 38, 0x301)) # RTM_GETQDISC dump
+
+    def test_error_reply(self):
+        rtnl = _FakeNetlinkSocket([_nlmsg(2, struct.pack("=i", -1))]) # NLMSG_ERROR, EPERM
+        app = qdisc_stats.QdiscStatsApplication()
+        app._QdiscStatsApplication__sequence = 0
+        with self.assertRaises(OSError):
+            app._QdiscStatsApplication__query_netlink(rtnl)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,14 +16,14 @@
 # along with this program. If not, see https://www.gnu.org/licenses/.
 #
 
+import os
 import time
 import signal
-import psutil
+import ctypes
 import traceback
 import time
+import multiprocessing
 
-from multiprocessing import Process, Manager
-from multiprocessing import Event as MultiprocessingEvent
 from threading import Event, Thread
 from typing import cast, Optional
 
@@ -36,7 +36,13 @@ from applications.generic_application_interface import GenericApplicationInterfa
 from global_state import GlobalState
 
 
+# Applications are started via fork (copy-on-write, modules are already imported),
+# independent of the platform default start method (forkserver since Python 3.14)
+_FORK_CONTEXT = multiprocessing.get_context("fork")
+
+
 class ApplicationController(Thread):
+    __SIGTERM_GRACE = 5 # seconds before timed out Applications are killed
             
     def __init__(self, app: BaseApplication, config: ApplicationConfig, 
                  client: ManagementClient, instance_name: str,
@@ -48,11 +54,10 @@ class ApplicationController(Thread):
         self.application_manager = application_manager
         self.settings = config.settings
         self.is_terminated = Event()
-        self.manager = Manager()
-        self.shared_state = self.manager.dict()
-        self.started_event = MultiprocessingEvent()
+        # Shared memory instead of a Manager, which needs its own server process
+        self.error_flag = _FORK_CONTEXT.Value(ctypes.c_bool, False, lock=False)
+        self.started_event = _FORK_CONTEXT.Event()
         self.instance_name = instance_name
-        self.shared_state["error_flag"] = False
         self.t0: Optional[float] = None
         self.start_defered: bool = False
         self.daemon = True
@@ -65,10 +70,14 @@ class ApplicationController(Thread):
         """
         Important: This method will be forked away from main instance_manager
         process. In order to communicate back to the main process, the
-        shared_state has to be used! Only the main process has a connection
+        error_flag has to be used! Only the main process has a connection
         to the management server!
         """
 
+        # Own process group, the Application and all of its children
+        # can be signalled at once on timeout
+        os.setpgrp()
+
         try:
             try:
                 interface = ApplicationInterface(self.config.name, 
@@ -85,17 +94,30 @@ class ApplicationController(Thread):
 
             interface.disconnect()
             if not rc:
-                self.shared_state["error_flag"] = True
+                self.error_flag.value = True
         except Exception as ex:
             traceback.print_exception(ex)
-            self.shared_state["error_flag"] = True
+            self.error_flag.value = True
+
+    def __signal_group(self, process, sig: signal.Signals) -> None:
+        # The Application process is the leader of its group, see __fork_run
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass # All processes of the group have exited
+        except Exception as ex:
+            self.mgmt_client.send_extended_app_log(application=self.config.name,
+                                                   message=f"Application is unable to kill children: {ex}", 
+                                                   type=LogMessageType.MSG_ERROR, 
+                                                   print_to_user=True,
+                                                   new_status=ApplicationStatus.EXECUTION_FAILED)
 
     def update_t0(self, t0: float) -> None:
         self.t0 = t0
 
     def run(self):
         self.started_event.clear()
-        process = Process(target=self.__fork_run, args=())
+        process = _FORK_CONTEXT.Process(target=self.__fork_run, args=())
         # Python >= 3.11 used nanosleep, which is quite accurate
         if self.t0 is None:
             wait_for = self.config.delay
@@ -136,29 +158,22 @@ class ApplicationController(Thread):
                                                        type=LogMessageType.MSG_ERROR, 
                                                        print_to_user=True,
                                                        new_status=ApplicationStatus.EXECUTION_FAILED)
-                try:
-                    parent = psutil.Process(process.ident)
-                    for child in parent.children(recursive=True):
-                        try: child.send_signal(signal.SIGTERM)
-                        except Exception as ex:
-                            self.mgmt_client.send_extended_app_log(application=self.config.name,
-                                                                   message=f"Application is unable to kill children: {ex}", 
-                                                                   type=LogMessageType.MSG_ERROR, 
-                                                                   print_to_user=True,
-                                                                   new_status=ApplicationStatus.EXECUTION_FAILED)
-                            continue
-                except Exception as ex:
+                self.__signal_group(process, signal.SIGTERM)
+                process.terminate()
+                process.join(ApplicationController.__SIGTERM_GRACE)
+
+                # Processes that ignore SIGTERM would block the join below forever
+                if process.is_alive():
                     self.mgmt_client.send_extended_app_log(application=self.config.name,
-                                                           message=f"Application is unable get children: {ex}", 
+                                                           message="Application did not terminate, killing it.", 
                                                            type=LogMessageType.MSG_ERROR, 
-                                                           print_to_user=True,
-                                                           new_status=ApplicationStatus.EXECUTION_STARTED)
-
-                process.terminate()
+                                                           print_to_user=True)
+                    self.__signal_group(process, signal.SIGKILL)
+                    process.kill()
             
             process.join()
 
-        if self.shared_state["error_flag"] or timed_out:
+        if self.error_flag.value or timed_out:
             self.mgmt_client.send_extended_app_log(application=self.config.name,
                                                    message=f"Application '{self.config.name}' failed", 
                                                    type=LogMessageType.MSG_ERROR, 
@@ -183,7 +198,7 @@ class ApplicationController(Thread):
         return self.is_terminated.is_set()
     
     def error_occurred(self) -> bool:
-        return self.shared_state["error_flag"]
+        return self.error_flag.value
     
     def get_application_name(self) -> str:
         return self.config.name
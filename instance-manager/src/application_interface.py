@@ -21,7 +21,7 @@ import socket
 import sys
 import select
 
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
 from applications.generic_application_interface import LogMessageLevel, GenericApplicationInterface
 from common.instance_manager_message import LogMessageType
@@ -120,6 +120,27 @@ class ApplicationInterface(GenericApplicationInterface):
 
         return self._send_to_daemon(payload)
 
+    def data_points(self, series_name: str, 
+                    rows: List[Tuple[Dict[str, int | float], Optional[Dict[str, str]]]]) -> bool:
+
+        if self.dont_store or len(rows) == 0:
+            return True
+        
+        batch = []
+        for points, additional_tags in rows:
+            tags = {} if additional_tags is None else additional_tags
+            tags["application"] = self.app_name
+            batch.append({"points": points, "tags": tags})
+
+        # One round trip to the Instance Manager Daemon for all rows
+        payload = {
+            "type": "databatch",
+            "measurement": series_name,
+            "rows": batch
+        }
+
+        return self._send_to_daemon(payload)
+
     def preserve_file(self, path: str) -> bool:
         payload = {
             "type": "preserve",
@@ -144,7 +165,8 @@ class ApplicationInterface(GenericApplicationInterface):
     def run_command_and_stream(self, command: str | List[str], 
                                shell: bool = False, timeout: Optional[int] = None, 
                                print_to_user: bool = False, 
-                               store_in_log: bool = True) -> int:
+                               store_in_log: bool = True,
+                               env: Optional[Dict[str, str]] = None) -> int:
         def _log_stdout(message: str):
             self.push_log_message(message=message,
                                   type=LogMessageType.STDOUT,
@@ -158,4 +180,4 @@ class ApplicationInterface(GenericApplicationInterface):
                                   store_in_log=store_in_log)
         
         streamer = LogStreamer(_log_stdout, _log_stderr)
-        return streamer.run_and_stream(command, shell=shell, timeout=timeout)
+        return streamer.run_and_stream(command, shell=shell, timeout=timeout, env=env)
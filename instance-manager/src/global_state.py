@@ -15,9 +15,16 @@
 # You should have received a copy of the GNU General Public License 
 # along with this program. If not, see https://www.gnu.org/licenses/.
 #
+from dataclasses import dataclass
 
-class GlobalState:
+
+@dataclass(slots=True)
+class _GlobalState:
     testbed_package_path: str = None
     im_daemon_socket_path: str = None
     exchange_mount_path: str = None
     start_exec_path: str = None
+
+
+# Module singleton, slots reject misspelled attributes on assignment
+GlobalState = _GlobalState()
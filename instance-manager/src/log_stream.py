@@ -15,10 +15,12 @@
 # along with this program. If not, see https://www.gnu.org/licenses/.
 #
 
+import os
+import signal
 import subprocess
 import threading
 
-from typing import List, Optional
+from typing import List, Optional, Dict
 
 class LogStreamer:
     def __init__(self, stdout_log_fn, stderr_log_fn):
@@ -26,7 +28,8 @@ class LogStreamer:
         self.stderr = stderr_log_fn
 
     def run_and_stream(self, command: str | List[str], shell: bool = False, 
-                       timeout: Optional[int] = None) -> int:
+                       timeout: Optional[int] = None, 
+                       env: Optional[Dict[str, str]] = None) -> int:
         def single_line_reader(pipe, log_fn):
             if log_fn is None:
                 return
@@ -35,12 +38,16 @@ class LogStreamer:
                 log_fn(line.rstrip())
             pipe.close()
 
+        # With a timeout, the command gets its own process group, so that the
+        # whole tree (e.g., a shell and its children) can be killed at once
         proc = subprocess.Popen(command,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
             bufsize=1,
-            shell=shell
+            shell=shell,
+            env=env,
+            start_new_session=timeout is not None
         )
 
         stdout_thread = threading.Thread(target=single_line_reader, 
@@ -52,6 +59,14 @@ class LogStreamer:
 
         try:
             proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # Readers only finish when all holders of the pipes have exited
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            proc.wait()
+            raise
         except Exception as ex:
             raise ex
         finally:
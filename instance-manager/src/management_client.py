@@ -24,7 +24,7 @@ import os
 import json
 import jsonpickle
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, List, Tuple
 from threading import Lock
 from abc import ABC, abstractmethod
 
@@ -205,20 +205,32 @@ class ManagementClient():
         if points is None:
             return
 
-        data = [
-            {
+        self.send_data_points(measurement, [(points, tags)])
+
+    def send_data_points(self, measurement: str, rows: List[Tuple[Dict[str, int | float], Optional[Dict[str, str]]]]):
+        data = []
+        for points, tags in rows:
+            if points is None:
+                continue
+
+            point = {
                 "measurement": measurement,
                 "tags": {
                     "instance": self.instance_name,
                 },
                 "fields": points
             }
-        ]
 
-        if tags is not None:
-            for k, v in tags.items():
-                data[0]["tags"][k] = v
+            if tags is not None:
+                for k, v in tags.items():
+                    point["tags"][k] = v
+            
+            data.append(point)
+        
+        if len(data) == 0:
+            return
 
+        # All points are sent in one message, the controller inserts them at once
         message = DownstreamMessage(InstanceMessageType.DATA_POINT, data)
         self.send_to_server(message)
 
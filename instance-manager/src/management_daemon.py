@@ -30,6 +30,16 @@ from common.instance_manager_message import InstanceMessageType, LogMessageType
 from global_state import GlobalState
 
 
+# Log levels accepted from Applications via the daemon socket
+_LOG_LEVELS = {
+    "SUCCESS": LogMessageType.MSG_SUCCESS,
+    "INFO": LogMessageType.MSG_INFO,
+    "WARNING": LogMessageType.MSG_WARNING,
+    "ERROR": LogMessageType.MSG_ERROR,
+    "DEBUG": LogMessageType.MSG_DEBUG,
+}
+
+
 class IMClientThread(Thread):
     client_id: int = 0
     id_lock = Lock()
@@ -76,20 +86,9 @@ class IMClientThread(Thread):
         if "level" not in data or "message" not in data:
             return self._respond_to_client(False, "'message' or 'level' missing for log")
         
-        level = None
-        match data["level"]:
-            case "SUCCESS":
-                level = LogMessageType.MSG_SUCCESS
-            case "INFO":
-                level = LogMessageType.MSG_INFO
-            case "WARNING":
-                level = LogMessageType.MSG_WARNING
-            case "ERROR":
-                level = LogMessageType.MSG_ERROR
-            case "DEBUG":
-                level = LogMessageType.MSG_DEBUG
-            case _:
-                return self._respond_to_client(False, f"Invalid log level '{data['level']}'")
+        level = _LOG_LEVELS.get(data["level"]) if isinstance(data["level"], str) else None
+        if level is None:
+            return self._respond_to_client(False, f"Invalid log level '{data['level']}'")
             
         if not isinstance(data["message"], str):
             return self._respond_to_client(False, f"Field 'message' is not a string")
@@ -97,6 +96,21 @@ class IMClientThread(Thread):
         self.manager.send_extended_system_log(data['message'], level, True, True)
         return self._respond_to_client(True)
     
+    def _validate_data(self, tags, points) -> Optional[str]:
+        if not isinstance(tags, dict):
+            return "'tags' is not a dict of strings"
+        
+        if not all((isinstance(key, str) and isinstance(value, (str, int))) for key, value in tags.items()):
+            return "'tags' contains invalid keys or values"
+        
+        if not isinstance(points, dict) or not len(points):
+            return "'points' has no values or is invalid"
+
+        if not all((isinstance(key, str) and isinstance(value, (int, float))) for key, value in points.items()):
+            return "'points' contains non float or int values"
+        
+        return None
+
     def _handle_data(self, data) -> bool:
         if "measurement" not in data or "tags" not in data or "points" not in data:
             return self._respond_to_client(False, "'measurement', 'tags' or 'points' missing for data")
@@ -105,21 +119,36 @@ class IMClientThread(Thread):
             return self._respond_to_client(False, f"Field 'measurement' is not a string")
         measurement = data["measurement"]
         
-        if not isinstance(data["tags"], dict):
-            return self._respond_to_client(False, "'tags' is not a dict of strings")
+        error = self._validate_data(data["tags"], data["points"])
+        if error is not None:
+            return self._respond_to_client(False, error)
         
-        if not all((isinstance(key, str) and isinstance(value, (str, int))) for key, value in data["tags"].items()):
-            return self._respond_to_client(False, "'tags' contains invalid keys or values")
-        tags = data["tags"]
+        self.manager.send_data_point(measurement, data["points"], data["tags"])
+        return self._respond_to_client(True)
+    
+    def _handle_data_batch(self, data) -> bool:
+        if "measurement" not in data or "rows" not in data:
+            return self._respond_to_client(False, "'measurement' or 'rows' missing for databatch")
         
-        if not isinstance(data["points"], dict) or not len(data["points"]):
-            return self._respond_to_client(False, "'points' has no values or is invalid")
+        if not isinstance(data["measurement"], str):
+            return self._respond_to_client(False, f"Field 'measurement' is not a string")
+        measurement = data["measurement"]
 
-        if not all((isinstance(key, str) and isinstance(value, (int, float))) for key, value in data["points"].items()):
-            return self._respond_to_client(False, "'points' contains non float or int values")
-        points = data["points"]
+        if not isinstance(data["rows"], list) or not len(data["rows"]):
+            return self._respond_to_client(False, "'rows' has no values or is invalid")
+        
+        rows = []
+        for row in data["rows"]:
+            if not isinstance(row, dict) or "tags" not in row or "points" not in row:
+                return self._respond_to_client(False, "'tags' or 'points' missing in row of databatch")
+            
+            error = self._validate_data(row["tags"], row["points"])
+            if error is not None:
+                return self._respond_to_client(False, error)
+            
+            rows.append((row["points"], row["tags"]))
         
-        self.manager.send_data_point(measurement, points, tags)
+        self.manager.send_data_points(measurement, rows)
         return self._respond_to_client(True)
     
     def _handle_shutdown(self, data) -> bool:
@@ -188,6 +217,8 @@ class IMClientThread(Thread):
                 status = self._handle_log(json_data)
             case "data":
                 status = self._handle_data(json_data)
+            case "databatch":
+                status = self._handle_data_batch(json_data)
             case "shutdown":
                 status = self._handle_shutdown(json_data)
             case "extended":
@@ -26,7 +26,7 @@ from utils.settings import IntegrationSettings
 from base_integration import BaseIntegration, IntegrationStatusContainer
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadaleIntegrationSettings(IntegrationSettings):
     delay: int
     message: str